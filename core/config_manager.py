@@ -3,7 +3,7 @@
 import json
 import os
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Set, Tuple
 from kivy.logger import Logger
 
 class ConfigManager:
@@ -16,6 +16,8 @@ class ConfigManager:
                  default_config_filepath: str | Path = "data/config.json"):
         Logger.info("ConfigManager: Initializing.")
         self._config: Dict[str, Any] = {}
+        # Sections changed in memory since the config was last loaded or saved
+        self._dirty_sections: Set[str] = set()
         self._user_config_filepath = Path(user_config_filepath)
         self._default_config_filepath = Path(default_config_filepath)
 
@@ -106,17 +108,30 @@ class ConfigManager:
                 Logger.error(f"Unexpected error loading user config from {self._user_config_filepath}: {e}. Using loaded defaults.")
 
         self._config = default_config # The final merged config becomes the active config
+        self._dirty_sections.clear()
         Logger.info("ConfigManager: Configuration loaded successfully.")
 
 
     def save_config(self) -> None:
-        """Saves the current configuration to the user config file."""
+        """
+        Saves the current configuration to the user config file.
+        Skipped when nothing changed since the last load or save and the file already exists.
+        """
+        if not self._dirty_sections and self._user_config_filepath.is_file():
+            Logger.debug("ConfigManager: No changes since last save; skipping write.")
+            return
         Logger.info(f"ConfigManager: Saving configuration to {self._user_config_filepath}.")
         try:
             # Ensure the directory exists before saving
             self._user_config_filepath.parent.mkdir(parents=True, exist_ok=True)
-            with open(self._user_config_filepath, 'w') as f:
-                json.dump(self._config, f, indent=4)
+            data = json.dumps(self._config, indent=4).encode('utf-8')
+            # Write to a temporary file and rename it over the config, so an interrupted
+            # save can't leave a truncated config behind
+            tmp_filepath = self._user_config_filepath.with_name(self._user_config_filepath.name + '.tmp')
+            with open(tmp_filepath, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_filepath, self._user_config_filepath)
+            self._dirty_sections.clear()
             Logger.info("ConfigManager: Configuration saved.")
         except Exception as e:
             Logger.error(f"Error saving configuration to {self._user_config_filepath}: {e}")
@@ -148,6 +163,7 @@ class ConfigManager:
                 Logger.error(f"Unexpected error loading default config from {self._default_config_filepath} during reset: {e}. Using internal defaults.")
 
         self._config = default_config # Set the active config to defaults
+        self._dirty_sections.update(self._config)
         self.save_config() # Immediately save these defaults to user config file
         Logger.info("ConfigManager: Configuration reset to defaults and saved.")
         return self._config.copy()
@@ -193,12 +209,31 @@ class ConfigManager:
 
              Logger.debug(f"ConfigManager: Created new section '{section}' in config (based on defaults).")
 
-        self._config[section][key] = value
+        section_config = self._config[section]
+        if key in section_config and section_config[key] == value:
+            Logger.debug(f"ConfigManager: Setting '{section}.{key}' unchanged.")
+            return
+        section_config[key] = value
+        self._dirty_sections.add(section)
         Logger.info(f"ConfigManager: Setting '{section}.{key}' updated in memory.")
 
         # Note: save_config must be called explicitly to persist changes.
 
 
+    def snapshot(self) -> Dict[Tuple[str, str], Any]:
+        """
+        Returns every setting as one flat dict keyed by (section, key).
+        Values resolve like get_setting: the current config first, then the internal defaults.
+        """
+        settings: Dict[Tuple[str, str], Any] = {}
+        for source in (self._internal_default_config, self._config):
+            for section, values in source.items():
+                if isinstance(values, dict):
+                    for key, value in values.items():
+                        settings[(section, key)] = value
+        return settings
+
+
     def get_all_settings(self) -> Dict:
         """Returns a copy of the entire current configuration dictionary."""
         return self._config.copy()
@@ -8,7 +8,7 @@ import difflib
 import hashlib
 from pathlib import Path
 from collections import defaultdict
-from typing import Dict, List, Optional, Pattern, TypedDict, Any, Tuple
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Pattern, Set, TypedDict, Any, Tuple
 
 from kivy.logger import Logger
 from time import time
@@ -41,12 +41,16 @@ class LanguageProfile(TypedDict):
     syntax_tokens: CompiledPatterns
     suggestions_categorized: Dict[str, List[str]]
 
-class SymbolInfo(TypedDict):
+# (name, type, scope) of the enclosing function or class
+ParentInfo = Tuple[str, str, int]
+
+class SymbolInfo(NamedTuple):
+    name: str
     type: str
     scope: int
     line_num: int
-    name: str
-    metadata: Dict[str, Any]
+    parent: Optional[ParentInfo] = None
+    defined_in: Optional[Tuple[str, str]] = None
 
 # --- Constants ---
 ASSETS_DIR = Path(__file__).parent.parent / "assets" / "language_profiles"
@@ -60,6 +64,7 @@ class LanguageProfileManager:
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._profiles: Dict[str, LanguageProfile] = {}
+            cls._instance._flat_cache: Dict[str, FrozenSet[str]] = {}
             cls._instance._load_profiles()
             Logger.info("LanguageProfileManager initialized and profiles loaded.")
         return cls._instance
@@ -228,7 +233,7 @@ class LanguageProfileManager:
         profile = self._profiles.get(requested_language)
 
         if profile:
-            Logger.debug(f"Found profile for language: {requested_language}")
+            Logger.debug("Found profile for language: %s", requested_language)
             return profile
 
         generic_profile = self._profiles.get('generic')
@@ -251,6 +256,22 @@ class LanguageProfileManager:
         }
 
 
+    def get_flat_suggestions(self, language: str) -> FrozenSet[str]:
+        """Returns the union of all suggestion categories for a language, computed once per profile."""
+        profile = self.get_profile(language)
+        profile_language = profile['language']
+        flat = self._flat_cache.get(profile_language)
+        if flat is None:
+            flat = frozenset(
+                suggestion
+                for category_list in profile.get('suggestions_categorized', {}).values()
+                if isinstance(category_list, list)
+                for suggestion in category_list
+            )
+            self._flat_cache[profile_language] = flat
+        return flat
+
+
     def get_available_languages(self) -> List[str]:
         """Returns a sorted list of available language profile names."""
         return sorted(self._profiles.keys())
@@ -260,19 +281,23 @@ class SymbolTable:
     """Manages symbols and their scopes."""
     def __init__(self):
         self.symbols: Dict[int, Dict[str, SymbolInfo]] = defaultdict(dict)
+        self._parent_of: Dict[int, int] = {}
         # self._symbol_by_name_and_scope: Dict[Tuple[str, int], SymbolInfo] = {}
         Logger.info("SymbolTable initialized.")
 
     def clear(self) -> None:
         """Clears all symbols from the table."""
         self.symbols.clear()
+        self._parent_of.clear()
         # self._symbol_by_name_and_scope.clear()
         Logger.debug("SymbolTable cleared.")
 
-    def enter_scope(self, scope_id: int) -> None:
+    def enter_scope(self, scope_id: int, parent_id: Optional[int] = None) -> None:
         """Notifies the symbol table that a new scope is being entered."""
         if scope_id not in self.symbols:
             self.symbols[scope_id] = {}
+        if parent_id is not None and parent_id != scope_id:
+            self._parent_of[scope_id] = parent_id
 
     def exit_scope(self) -> None:
         """Notifies the symbol table that a scope is being exited."""
@@ -280,55 +305,61 @@ class SymbolTable:
 
     def add_symbol(self, name: str, symbol_type: str,
                   scope_id: int, line_num: int,
-                  metadata: Optional[Dict[str, Any]] = None) -> None:
+                  parent: Optional[ParentInfo] = None,
+                  defined_in: Optional[Tuple[str, str]] = None) -> None:
         """Adds a symbol to the table."""
-        if not metadata:
-            metadata = {}
-
         symbol_key = name
 
         if scope_id not in self.symbols:
             self.symbols[scope_id] = {}
 
         existing_symbol = self.symbols[scope_id].get(symbol_key)
-        if existing_symbol and existing_symbol['line_num'] == line_num:
+        if existing_symbol and existing_symbol.line_num == line_num:
             return
 
-        self.symbols[scope_id][symbol_key] = {
-            'name': name,
-            'type': symbol_type,
-            'scope': scope_id,
-            'line_num': line_num,
-            'metadata': metadata.copy()
-        }
+        self.symbols[scope_id][symbol_key] = SymbolInfo(name, symbol_type, scope_id, line_num, parent, defined_in)
         # self._symbol_by_name_and_scope[(name, scope_id)] = self.symbols[scope_id][symbol_key]
         # Logger.debug(f"Added symbol: {name} ({symbol_type}) at scope {scope_id}, line {line_num}")
 
 
     def remove_symbols_in_range(self, start_line: int, end_line: int) -> None:
         """Removes symbols defined within a specific line range."""
-        Logger.debug(f"SymbolTable: Attempting to remove symbols in line range [{start_line}, {end_line})")
+        Logger.debug("SymbolTable: Attempting to remove symbols in line range [%d, %d)", start_line, end_line)
         removed_count = 0
         for scope_id in list(self.symbols.keys()):
             symbols_in_scope = self.symbols[scope_id]
             for symbol_key in list(symbols_in_scope.keys()):
                 symbol_info = symbols_in_scope[symbol_key]
-                if start_line <= symbol_info.get('line_num', -1) < end_line:
+                if start_line <= symbol_info.line_num < end_line:
                     del symbols_in_scope[symbol_key]
                     # if (symbol_info['name'], scope_id) in self._symbol_by_name_and_scope:
                     #     del self._symbol_by_name_and_scope[(symbol_info['name'], scope_id)]
                     removed_count += 1
-                    Logger.debug(f"Removed symbol '{symbol_info.get('name', symbol_key)}' from scope {scope_id} (defined on line {symbol_info.get('line_num', -1)}).")
             if not symbols_in_scope:
                 del self.symbols[scope_id]
-                Logger.debug(f"Removed empty scope {scope_id}.")
+                Logger.debug("Removed empty scope %d.", scope_id)
 
-        Logger.debug(f"SymbolTable: Finished removing {removed_count} symbols in range [{start_line}, {end_line}).")
+        Logger.debug("SymbolTable: Finished removing %d symbols in range [%d, %d).", removed_count, start_line, end_line)
 
     def get_symbols_in_scope(self, scope_id: int) -> Dict[str, SymbolInfo]:
         """Gets all symbols within a specific scope ID."""
         return self.symbols.get(scope_id, {})
 
+    def get_symbols(self, scope_id: int) -> Set[str]:
+        """Gets the names visible from a scope by walking its parent chain iteratively."""
+        names: Set[str] = set()
+        symbols = self.symbols
+        parent_of = self._parent_of
+        current_id = scope_id
+        while True:
+            scope_symbols = symbols.get(current_id)
+            if scope_symbols:
+                names.update(scope_symbols)
+            if current_id == 0:
+                break
+            current_id = parent_of.get(current_id, 0)
+        return names
+
     def get_visible_symbols(self, scope_stack: List[int]) -> List[SymbolInfo]:
         """Gets all symbols visible from the current scope stack."""
         visible_symbols: Dict[str, SymbolInfo] = {}
@@ -338,7 +369,7 @@ class SymbolTable:
                     if symbol_name not in visible_symbols:
                         visible_symbols[symbol_name] = symbol_info
 
-        return sorted(visible_symbols.values(), key=lambda x: x['name'])
+        return sorted(visible_symbols.values(), key=lambda x: x.name)
 
     def get_all_symbols(self) -> List[SymbolInfo]:
         """Returns all symbols in the table, regardless of scope."""
@@ -346,14 +377,16 @@ class SymbolTable:
         for scope_id in self.symbols:
             all_symbols.extend(self.symbols[scope_id].values())
 
-        return sorted(all_symbols, key=lambda x: (x['line_num'], x['scope'], x['name']))
+        return sorted(all_symbols, key=lambda x: (x.line_num, x.scope, x.name))
 
 
 class CodeAnalyzer:
     """Analyzes code text based on a language profile to find syntax tokens and symbols."""
     def __init__(self, language: str = 'python'):
         self.language = language.lower()
-        self.profile = LanguageProfileManager().get_profile(self.language)
+        profile_manager = LanguageProfileManager()
+        self.profile = profile_manager.get_profile(self.language)
+        self._profile_sugg: FrozenSet[str] = profile_manager.get_flat_suggestions(self.language)
         self.symbol_table = SymbolTable()
 
         self.current_scope: int = 0
@@ -373,6 +406,9 @@ class CodeAnalyzer:
         self._prev_symbol_table_state: Dict[int, Dict[str, SymbolInfo]] = {}
         self._prev_syntax_token_ranges: List[Tuple[int, int, str]] = []
 
+        # Bumped on every analysis so callers can drop completions computed for older text
+        self.doc_version: int = 0
+
         self._reset_state()
         Logger.info(f"CodeAnalyzer initialized for language: {self.language}")
 
@@ -398,6 +434,7 @@ class CodeAnalyzer:
         """Performs full or incremental analysis of the provided text."""
         Logger.info(f"Starting analysis for: {self.language}")
         start_time = time()
+        self.doc_version += 1
 
         self._previous_text = self._current_text if hasattr(self, '_current_text') else None
         self._prev_line_hashes = self._current_line_hashes.copy()
@@ -422,6 +459,79 @@ class CodeAnalyzer:
 
         self._finalize_analysis(start_time)
 
+    def analyze_edit(self, new_text: str, change_range: Tuple[int, int]) -> int:
+        """
+        Re-analyzes only the top-level block touched by an edit.
+
+        Args:
+            new_text: The full text after the edit.
+            change_range: The (start_line, end_line) of the edit, end inclusive.
+        Returns:
+             The document version of the resulting analysis.
+        """
+        if self._current_text is None:
+            self.analyze_text(new_text)
+            return self.doc_version
+
+        old_lines = self._current_text.split('\n')
+        new_lines = new_text.split('\n')
+        if len(old_lines) != len(new_lines):
+            # Shifted line numbers invalidate every stored line state, fall back to the diff-based path
+            self.analyze_text(new_text)
+            return self.doc_version
+
+        start_time = time()
+        self.doc_version += 1
+
+        block_start, block_end = self._enclosing_block(new_lines, *change_range)
+        Logger.debug("CodeAnalyzer: Re-analyzing lines [%d, %d) for edit %s", block_start, block_end, change_range)
+
+        old_start_offset = sum(len(line) + 1 for line in old_lines[:block_start])
+        old_end_offset = old_start_offset + sum(len(line) + 1 for line in old_lines[block_start:block_end])
+        new_end_offset = old_start_offset + sum(len(line) + 1 for line in new_lines[block_start:block_end])
+        delta = new_end_offset - old_end_offset
+
+        token_ranges = self._current_syntax_token_ranges
+        tokens_before = [token for token in token_ranges if token[0] < old_start_offset]
+        tokens_after = [(start + delta, end + delta, token_type)
+                        for start, end, token_type in token_ranges if start >= old_end_offset]
+
+        self.symbol_table.remove_symbols_in_range(block_start, block_end)
+        self._current_syntax_token_ranges = tokens_before
+        self.scope_stack = [0]
+        self.current_function = None
+        self.current_class = None
+
+        offset = old_start_offset
+        for i in range(block_start, block_end):
+            line = new_lines[i]
+            self._current_line_hashes[i] = self._hash_line(line)
+            self._analyze_line_scope(i, line)
+            self._analyze_syntax_tokens(line, offset)
+            self._analyze_constructs(i, line, self.line_states[i]['scope'])
+            offset += len(line) + 1
+
+        self._current_syntax_token_ranges.extend(tokens_after)
+        self._current_text = new_text
+        self._finalize_analysis(start_time)
+        return self.doc_version
+
+    def _enclosing_block(self, lines: List[str], start_line: int, end_line: int) -> Tuple[int, int]:
+        """Widens a line range to the top-level blocks that contain it."""
+        last_line = len(lines) - 1
+        start_line = max(0, min(start_line, last_line))
+        end_line = max(start_line, min(end_line, last_line))
+
+        block_start = start_line
+        while block_start > 0 and (not lines[block_start].strip() or lines[block_start][0].isspace()):
+            block_start -= 1
+
+        block_end = end_line + 1
+        while block_end <= last_line and (not lines[block_end].strip() or lines[block_end][0].isspace()):
+            block_end += 1
+
+        return block_start, block_end
+
     def _hash_line(self, line: str) -> str:
         """Calculates the MD5 hash of a line."""
         return hashlib.md5(line.encode('utf-8')).hexdigest()
@@ -533,6 +643,7 @@ class CodeAnalyzer:
              self.scope_stack.append(0)
 
         self.current_scope = self.scope_stack[-1]
+        self.symbol_table.enter_scope(self.current_scope, self.scope_stack[-2] if len(self.scope_stack) > 1 else 0)
 
         if self.current_function and self.current_scope < self.current_function[2]:
              self.current_function = None
@@ -602,14 +713,7 @@ class CodeAnalyzer:
     def _handle_definition(self, line_num: int, construct_type: str, match: re.Match, scope_id: int) -> None:
         """Handles the detection of a definition (function, class, etc.) and adds to symbol table."""
         symbol_name: Optional[str] = None
-        parent_info: Dict[str, Any] = {}
-
-        if self.current_function:
-             parent_info['parent_name'] = self.current_function[0]
-             parent_info['parent_type'] = self.current_function[1]
-        elif self.current_class:
-             parent_info['parent_name'] = self.current_class[0]
-             parent_info['parent_type'] = self.current_class[1]
+        parent = self.current_function or self.current_class
 
         if construct_type in ['function', 'method', 'class', 'interface', 'struct', 'enum']:
              if match.lastindex is not None and match.lastindex >= 1:
@@ -622,7 +726,7 @@ class CodeAnalyzer:
                  symbol_name = None
 
         if symbol_name:
-             self.symbol_table.add_symbol(symbol_name, construct_type, scope_id, line_num, parent_info)
+             self.symbol_table.add_symbol(symbol_name, construct_type, scope_id, line_num, parent)
 
              if construct_type in ['function', 'method']:
                   self.current_function = (symbol_name, construct_type, scope_id)
@@ -645,24 +749,17 @@ class CodeAnalyzer:
 
              if params_str:
                   param_scope_id = scope_id + len(self.profile.get('indent', '    '))
+                  self.symbol_table.enter_scope(param_scope_id, scope_id)
+                  defined_in = (symbol_name, construct_type) if symbol_name else None
                   for param in self._parse_parameters(params_str):
                        if param:
-                            param_metadata = parent_info.copy()
-                            if symbol_name: param_metadata['defined_in'] = (symbol_name, construct_type)
-                            self.symbol_table.add_symbol(param, 'param', param_scope_id, line_num, param_metadata)
+                            self.symbol_table.add_symbol(param, 'param', param_scope_id, line_num, parent, defined_in)
 
 
     def _handle_symbol(self, line_num: int, symbol_type: str, match: re.Match, scope_id: int) -> None:
         """Handles the detection of other symbols (variables not in definition line, imports)."""
         symbol_name: Optional[str] = None
-        parent_info: Dict[str, Any] = {}
-
-        if self.current_function:
-             parent_info['parent_name'] = self.current_function[0]
-             parent_info['parent_type'] = self.current_function[1]
-        elif self.current_class:
-             parent_info['parent_name'] = self.current_class[0]
-             parent_info['parent_type'] = self.current_class[1]
+        parent = self.current_function or self.current_class
 
         if symbol_type == 'variable':
              if match.lastindex is not None and match.lastindex >= 1:
@@ -682,44 +779,48 @@ class CodeAnalyzer:
                             imported_names.extend([n.strip() for n in name.split(',') if n.strip()])
 
                   for imported_name in imported_names:
-                       self.symbol_table.add_symbol(imported_name, 'import', scope_id, line_num, parent_info)
+                       self.symbol_table.add_symbol(imported_name, 'import', scope_id, line_num, parent)
                   return
 
         if symbol_name:
-             self.symbol_table.add_symbol(symbol_name, symbol_type, scope_id, line_num, parent_info)
+             self.symbol_table.add_symbol(symbol_name, symbol_type, scope_id, line_num, parent)
 
 
-    def get_suggestions(self, exclude_categories: Optional[List[str]] = None) -> List[str]:
+    def get_suggestions(self, exclude_categories: Optional[List[str]] = None,
+                        doc_version: Optional[int] = None) -> List[str]:
         """
         Generates context-aware code completion suggestions.
 
         Args:
             exclude_categories: A list of suggestion categories (from the profile) to exclude.
+            doc_version: The document version the request was made for; stale requests get no suggestions.
         Returns:
              A sorted list of all relevant suggestions.
         """
-        Logger.info("\n=== Generating Contextual Suggestions ===")
-        suggestions: set[str] = set()
-
-        excluded_categories_set = set(exclude_categories) if exclude_categories else set()
+        if doc_version is not None and doc_version < self.doc_version:
+            Logger.debug("Dropping stale suggestion request (version %d < %d).", doc_version, self.doc_version)
+            return []
 
-        if self.profile and self.profile.get('suggestions_categorized'):
-            for category, category_list in self.profile['suggestions_categorized'].items():
-                # Check if the category should be excluded
-                if category not in excluded_categories_set:
-                    if isinstance(category_list, list):
-                        suggestions.update(category_list)
-                else:
-                    Logger.debug(f"Excluding suggestion category: {category}")
+        Logger.debug("=== Generating Contextual Suggestions ===")
+        visible_names = self.symbol_table.get_symbols(self.current_scope)
 
-        visible_symbols_info = self.symbol_table.get_visible_symbols(self.scope_stack)
-        suggestions.update([sym['name'] for sym in visible_symbols_info])
+        if not exclude_categories:
+            # Fast path: the flattened profile suggestions are precomputed per language
+            suggestions = self._profile_sugg.union(visible_names)
+        else:
+            excluded_categories_set = set(exclude_categories)
+            category_lists = (
+                category_list
+                for category, category_list in self.profile.get('suggestions_categorized', {}).items()
+                if category not in excluded_categories_set and isinstance(category_list, list)
+            )
+            suggestions = frozenset().union(*category_lists, visible_names)
 
-        sorted_suggestions = sorted(list(suggestions))
+        sorted_suggestions = sorted(suggestions)
 
         # Removed slicing based on limit
 
-        Logger.debug(f"Generated {len(sorted_suggestions)} raw suggestions.")
+        Logger.debug("Generated %d raw suggestions.", len(sorted_suggestions))
         return sorted_suggestions
 
 
@@ -732,7 +833,7 @@ class CodeAnalyzer:
         """Returns all detected symbols with their details and parent information."""
         all_symbols = self.symbol_table.get_all_symbols()
 
-        return sorted(all_symbols, key=lambda x: (x['line_num'], x['scope'], x['name']))
+        return sorted(all_symbols, key=lambda x: (x.line_num, x.scope, x.name))
 
 
     def _calculate_offset_of_line(self, lines: List[str], line_num: int) -> int:
@@ -792,8 +893,9 @@ f = lambda a : a + 1
     # Get and print all suggestions, excluding 'operators'
     suggestions_first = analyzer.get_suggestions(exclude_categories=['operators'])
     Logger.info("\n=== All Contextual Suggestions (First Analysis - Operators Excluded) ===")
+    Logger.info("Suggestions: %d items", len(suggestions_first))
     for i, suggestion in enumerate(suggestions_first):
-        Logger.info(f" {i+1}. {suggestion}")
+        Logger.debug(" %d. %s", i + 1, suggestion)
 
     Logger.info("\n=== Key Syntax Tokens (First Analysis) ===")
     syntax_tokens_first = analyzer.get_syntax_token_ranges()
@@ -835,10 +937,10 @@ f = lambda a : a + 1
     detected_symbols_first = analyzer.get_detected_symbols()
     for symbol in detected_symbols_first:
          parent_info_str = ""
-         if 'parent_name' in symbol['metadata'] and 'parent_type' in symbol['metadata']:
-              parent_info_str = f" (in {symbol['metadata']['parent_type']} '{symbol['metadata']['parent_name']}')"
+         if symbol.parent:
+              parent_info_str = f" (in {symbol.parent[1]} '{symbol.parent[0]}')"
          Logger.info(
-              f" {symbol['name']:<10} {symbol['type']:<10} (line {symbol['line_num']}, scope {symbol['scope']}){parent_info_str}"
+              f" {symbol.name:<10} {symbol.type:<10} (line {symbol.line_num}, scope {symbol.scope}){parent_info_str}"
          )
 
 
@@ -855,8 +957,9 @@ f = lambda a : a + 1
     # Get and print all suggestions, excluding 'operators' and 'builtins'
     suggestions_second = analyzer.get_suggestions(exclude_categories=['operators', 'builtins'])
     Logger.info("\n=== All Contextual Suggestions (Second Analysis - Operators & Builtins Excluded) =====")
+    Logger.info("Suggestions: %d items", len(suggestions_second))
     for i, suggestion in enumerate(suggestions_second):
-        Logger.info(f" {i+1}. {suggestion}")
+        Logger.debug(" %d. %s", i + 1, suggestion)
 
     Logger.info("\n=== Key Syntax Tokens (Second Analysis) ===")
     syntax_tokens_second = analyzer.get_syntax_token_ranges()
@@ -898,10 +1001,10 @@ f = lambda a : a + 1
     detected_symbols_second = analyzer.get_detected_symbols()
     for symbol in detected_symbols_second:
          parent_info_str = ""
-         if 'parent_name' in symbol['metadata'] and 'parent_type' in symbol['metadata']:
-              parent_info_str = f" (in {symbol['metadata']['parent_type']} '{symbol['metadata']['parent_name']}')"
+         if symbol.parent:
+              parent_info_str = f" (in {symbol.parent[1]} '{symbol.parent[0]}')"
          Logger.info(
-              f" {symbol['name']:<10} {symbol['type']:<10} (line {symbol['line_num']}, scope {symbol['scope']}){parent_info_str}"
+              f" {symbol.name:<10} {symbol.type:<10} (line {symbol.line_num}, scope {symbol.scope}){parent_info_str}"
          )
 
 
@@ -8,9 +8,12 @@ Handles:
 """
 
 import os
+import sys
 import json
+import pickle
+import hashlib
 from pathlib import Path
-from typing import Dict, List, Optional, TypedDict
+from typing import Dict, List, Optional, Tuple, TypedDict
 
 from kivy.core import text
 from kivy.logger import Logger
@@ -38,6 +41,8 @@ class SyntaxColors(TypedDict):
     selection: Dict[str, str]
     error: Dict[str, str]
 
+RGBA = Tuple[float, float, float, float]
+
 class ThemeData(TypedDict):
     theme_name: str
     primary_palette: str
@@ -50,11 +55,19 @@ class ThemeData(TypedDict):
 BASE_DIR = Path(__file__).parent.parent
 FONT_DIR = BASE_DIR / "assets" / "fonts"
 THEMES_DIR = BASE_DIR / "assets" / "themes"
+THEME_CACHE_NAME = ".cache.pkl"
+THEME_CACHE_VERSION = 2  # Bump when the prepared theme layout changes
+_REQUIRED_THEME_KEYS = frozenset(('theme_name', 'primary_palette', 'theme_style', 'syntax'))
+
+# Sorted font names, rebuilt lazily after each register_fonts() call
+_FONT_CACHE: Optional[List[str]] = None
 
 
 # --- Font Management ---
 def register_fonts(font_dir: Path = FONT_DIR) -> bool:
     """Register custom fonts from the given directory."""
+    global _FONT_CACHE
+    _FONT_CACHE = None
     if not font_dir.exists():
         Logger.warning(f"Font directory not found: {font_dir}")
         return False
@@ -73,9 +86,13 @@ def register_fonts(font_dir: Path = FONT_DIR) -> bool:
 
 def get_registered_font_names() -> List[str]:
     """Get sorted list of all registered font families."""
+    global _FONT_CACHE
+    if _FONT_CACHE is not None:
+        return list(_FONT_CACHE)
     try:
         if hasattr(text.LabelBase, 'get_registered_fonts'):
-            return sorted(text.LabelBase.get_registered_fonts().keys())
+            _FONT_CACHE = sorted(text.LabelBase.get_registered_fonts().keys())
+            return list(_FONT_CACHE)
         return []
     except Exception as e:
         Logger.error(f"Error getting font names: {e}")
@@ -88,6 +105,7 @@ class ThemeManager:
     def __init__(self):
         self._themes: Dict[str, ThemeData] = {}
         self._current_theme = ""
+        self._sorted_names: Optional[Tuple[str, ...]] = None
         Logger.info("ThemeManager initialized")
 
     def load_themes(self, themes_dir: Path = THEMES_DIR) -> int:
@@ -103,8 +121,18 @@ class ThemeManager:
             Logger.error(f"Themes directory not found: {themes_dir}")
             return 0
 
+        self._sorted_names = None
+        theme_files = sorted(themes_dir.glob("*.json"))
+        digest = self._themes_digest(theme_files)
+        cached = self._load_theme_cache(themes_dir, digest)
+        if cached:
+            self._themes.update(cached)
+            Logger.info(f"Loaded {len(cached)} themes from cache")
+            return len(cached)
+
         loaded = 0
-        for theme_file in themes_dir.glob("*.json"):
+        parsed: Dict[str, ThemeData] = {}
+        for theme_file in theme_files:
             try:
                 with open(theme_file, 'r', encoding='utf-8') as f:
                     theme = json.load(f)
@@ -114,6 +142,7 @@ class ThemeManager:
                 
                 theme_name = theme['theme_name']
                 self._themes[theme_name] = theme
+                parsed[theme_name] = theme
                 loaded += 1
                 Logger.info(f"Loaded theme: {theme_name}")
 
@@ -125,12 +154,50 @@ class ThemeManager:
         if not loaded:
             Logger.warning("No valid themes found - creating fallback")
             self._create_fallback_theme()
+        else:
+            self._save_theme_cache(themes_dir, digest, parsed)
 
         return loaded
 
+    @staticmethod
+    def _themes_digest(theme_files: List[Path]) -> bytes:
+        """Hash theme file names and mtimes so edits invalidate the cache."""
+        hasher = hashlib.blake2b()
+        for theme_file in theme_files:
+            hasher.update(f"{theme_file.name}:{theme_file.stat().st_mtime_ns}".encode())
+        return hasher.digest()
+
+    def _load_theme_cache(self, themes_dir: Path, digest: bytes) -> Optional[Dict[str, ThemeData]]:
+        """Return cached themes if the on-disk cache matches the current digest."""
+        cache_file = themes_dir / THEME_CACHE_NAME
+        if not cache_file.is_file():
+            return None
+        try:
+            with open(cache_file, 'rb') as f:
+                cache = pickle.load(f)
+        except Exception as e:
+            Logger.warning(f"Ignoring unreadable theme cache {cache_file.name}: {e}")
+            return None
+
+        if (not isinstance(cache, dict) or cache.get('version') != THEME_CACHE_VERSION
+                or cache.get('digest') != digest):
+            return None
+        return cache.get('themes')
+
+    def _save_theme_cache(self, themes_dir: Path, digest: bytes, themes: Dict[str, ThemeData]) -> None:
+        """Write the validated themes to the on-disk cache."""
+        cache_file = themes_dir / THEME_CACHE_NAME
+        try:
+            with open(cache_file, 'wb') as f:
+                pickle.dump({'version': THEME_CACHE_VERSION, 'digest': digest, 'themes': themes}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            Logger.warning(f"Could not write theme cache {cache_file.name}: {e}")
+
     def get_theme_names(self) -> List[str]:
         """Get sorted list of available theme names."""
-        return sorted(self._themes.keys())
+        if self._sorted_names is None:
+            self._sorted_names = tuple(sorted(self._themes.keys()))
+        return list(self._sorted_names)
 
     def apply_theme(self, theme_name: str) -> bool:
         """Apply a theme by name.
@@ -155,24 +222,51 @@ class ThemeManager:
             return None
         return self._themes.get(self._current_theme)
 
-    def get_theme_colors(self, theme_name: str) -> Optional[SyntaxColors]:
-        """Get syntax colors for a specific theme."""
+    def get_theme_colors(self, theme_name: str) -> Optional[Dict[str, RGBA]]:
+        """Get pre-parsed RGBA syntax colors for a specific theme."""
         theme = self._themes.get(theme_name)
-        return theme.get('syntax') if theme else None
+        return theme.get('_syntax_rgba') if theme else None
 
     def _validate_theme(self, theme: dict) -> bool:
         """Validate a theme dictionary has required fields."""
-        required = ['theme_name', 'primary_palette', 'theme_style', 'syntax']
-        if not all(key in theme for key in required):
+        if not _REQUIRED_THEME_KEYS.issubset(theme):
             Logger.error("Theme missing required fields")
             return False
         
         if not isinstance(theme['syntax'], dict):
             Logger.error("Theme syntax must be a dictionary")
             return False
-            
+
+        self._prepare_syntax_colors(theme)
         return True
 
+    @staticmethod
+    def _prepare_syntax_colors(theme: dict) -> None:
+        """Intern syntax hex strings and cache their RGBA values on the theme."""
+        syntax = theme['syntax']
+        for category, value in syntax.items():
+            if isinstance(value, str):
+                syntax[category] = sys.intern(value)
+            elif isinstance(value, dict):
+                for attr, attr_value in value.items():
+                    if isinstance(attr_value, str):
+                        value[attr] = sys.intern(attr_value)
+
+        rgba: Dict[str, RGBA] = {}
+        background = syntax.get('background')
+        if isinstance(background, str):
+            try:
+                rgba['background'] = tuple(get_color_from_hex(background))
+            except (ValueError, TypeError) as e:
+                Logger.warning(f"Invalid syntax background color: {e}")
+        for category, value in syntax.items():
+            if isinstance(value, dict) and 'color' in value:
+                try:
+                    rgba[category] = tuple(get_color_from_hex(value['color']))
+                except (ValueError, TypeError) as e:
+                    Logger.warning(f"Invalid color for syntax category '{category}': {e}")
+        theme['_syntax_rgba'] = rgba
+
     def _create_fallback_theme(self) -> None:
         """Create a minimal fallback theme when no themes are loaded."""
         self._themes['fallback'] = {
@@ -189,6 +283,8 @@ class ThemeManager:
                 'comment': {'color': '#808080', 'style': 'italic'}
             }
         }
+        self._prepare_syntax_colors(self._themes['fallback'])
+        self._sorted_names = None
         Logger.warning("Created fallback theme")
 
 # Initialize fonts when module is imported
@@ -31,6 +31,7 @@ class ConsoleDemoApp(MDApp):
         # Create main console
         self.console = Console()
         Logger.info("ConsoleDemoApp: Console widget created")
+        self.console.attach_streams()
 
         # Set the size_hint and pos_hint directly on the console widget
         self.console.size_hint = (0.95, 0.65)
@@ -42,10 +43,9 @@ class ConsoleDemoApp(MDApp):
         screen.add_widget(self.console)
         Logger.info("ConsoleDemoApp: Console widget added to screen")
 
-        # Schedule the demo runner function to start AFTER the console has been sized
-        # Bind the console's 'size' property to a method
-        self.console.bind(size=self._on_console_sized)
-        Logger.info("ConsoleDemoApp: Bound console.size to _on_console_sized")
+        # Start the demo runner on the next frame, once the first layout pass has run
+        Clock.schedule_once(self._start_demo, 0)
+        Logger.info("ConsoleDemoApp: Scheduled demo runner start")
 
         # Removed: Initial demo input request is now handled by the runner thread
         # Clock.schedule_once(self.demo_input_request, 2)
@@ -53,14 +53,8 @@ class ConsoleDemoApp(MDApp):
         Logger.info("ConsoleDemoApp: build method finished, returning screen")
         return screen
 
-    def _on_console_sized(self, instance, size):
-        """Called once after the console widget has received its size."""
-        Logger.info(f"ConsoleDemoApp: _on_console_sized called. Console size: {size}")
-        # Unbind the event to ensure this only runs once
-        instance.unbind(size=self._on_console_sized)
-        Logger.info("ConsoleDemoApp: Unbound console.size")
-
-        # Now that the console is sized, start the demo runner function in a separate thread
+    def _start_demo(self, dt):
+        """Starts the demo runner function in a separate thread."""
         Logger.info("ConsoleDemoApp: Starting demo runner thread...")
         demo_thread = threading.Thread(target=self.demo_runner_function, daemon=True)
         demo_thread.start()
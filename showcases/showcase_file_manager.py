@@ -3,7 +3,6 @@
 import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from kivy.lang import Builder
 from kivy.core.window import Window
 from kivymd.app import MDApp
 from kivymd.uix.boxlayout import MDBoxLayout
@@ -13,58 +12,30 @@ from kivymd.uix.toolbar import MDTopAppBar
 from kivymd.uix.snackbar import Snackbar
 from kivymd.toast import toast
 
+from ui.dialogs import InfoDialog
 from ui.utilities.file_manager import FileManager
 
 Window.softinput_mode = "below_target"
 
-KV = '''
-<DemoScreen>:
-    orientation: 'vertical'
-    spacing: '10dp'
+SAVE_CONTENT = (
+    "Custom file content\n" + "-"*40 +
+    "\nSaved by FileManager demo\n\nℹ️ Modern file manager FTW"
+)
+SAVE_BYTES = SAVE_CONTENT.encode('utf-8')
 
-    MDTopAppBar:
-        id: toolbar
-        title: "File Manager Demo"
-        elevation: 10
-        left_action_items: [["theme-light-dark", lambda x: app.toggle_theme()]]
-        right_action_items: [["information", lambda x: app.show_info()]]
-
-    ScrollView:
-        MDBoxLayout:
-            orientation: 'vertical'
-            spacing: '15dp'
-            padding: '20dp'
-            size_hint_y: None
-            height: self.minimum_height
-
-            MDRaisedButton:
-                text: "Save Content"
-                on_press: app.save_content()
-                size_hint_y: None
-                height: dp(50)
-
-            MDRaisedButton:
-                text: "Load File"
-                on_press: app.load_file()
-                size_hint_y: None
-                height: dp(50)
-
-            MDLabel:
-                id: content_label
-                text: "File content will appear here"
-                size_hint_y: None
-                height: self.texture_size[1]
-                padding: ['10dp', '10dp']
-                halign: 'center'
-                theme_text_color: "Primary"
-'''
-
-Builder.load_string(KV)
+INFO_TEXT = (
+    "File Manager Demo\n\n"
+    "• Save/Load files with theme support\n"
+    "• Dark/Light mode toggle\n"
+    "• Adaptive popup components"
+)
 
 class DemoScreen(MDBoxLayout):
     pass
 
 class FileManagerDemo(MDApp):
+    kv_file = 'showcase_file_manager.kv'
+
     def build(self):
         self.theme_cls.theme_style = "Light"
         self.theme_cls.primary_palette = "DeepPurple"
@@ -79,28 +50,16 @@ class FileManagerDemo(MDApp):
         toast(f"Theme: {mode}")
     
     def show_info(self):
-        content = (
-            "File Manager Demo\n\n"
-            "• Save/Load files with theme support\n"
-            "• Dark/Light mode toggle\n"
-            "• Adaptive popup components"
-        )
-        from ui.dialogs import InfoDialog
-        InfoDialog(title="About", text=content).open()
+        InfoDialog(title="About", text=INFO_TEXT).open()
     
     def save_content(self):
-        content = (
-            "Custom file content\n" + "-"*40 +
-            "\nSaved by FileManager demo\n\nℹ️ Modern file manager FTW"
-        )
-
         def callback(success, path):
             self.root.ids.content_label.text = (
-                f"File saved to:\n{path}\n\n{content}" if success
+                f"File saved to:\n{path}\n\n{SAVE_CONTENT}" if success
                 else "Save operation failed"
             )
 
-        self.file_manager.write_file(content, callback=callback)
+        self.file_manager.write_file(SAVE_BYTES, callback=callback, on_start=self._show_saving)
     
     def load_file(self):
         def callback(success, content):
@@ -108,7 +67,17 @@ class FileManagerDemo(MDApp):
                 content if success else "Failed to load file"
             )
 
-        self.file_manager.read_file(callback=callback)
+        self.file_manager.read_file(callback=callback, on_start=self._show_loading)
+
+    def _show_saving(self):
+        self.root.ids.content_label.text = "Saving..."
+
+    def _show_loading(self):
+        self.root.ids.content_label.text = "Loading..."
+
+    def on_stop(self):
+        # Let pending saves finish before the process exits
+        self.file_manager.shutdown()
 
 if __name__ == "__main__":
     FileManagerDemo().run()
\ No newline at end of file
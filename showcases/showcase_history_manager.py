@@ -30,8 +30,12 @@ class ShowcaseHistoryManager(App):
     def build(self):
         # Instantiate HistoryManager from the new module and INJECT the Kivy Clock instance
         self.history = HistoryManager(app_clock=Clock)
+        # Coalesce bursts of typing into a single history entry
+        self.history.debounce_time = 0.3
+        self.history.on_change = self._refresh_ui
 
         self.current_text = ""
+        self._suppress_change = False
 
         layout = BoxLayout(orientation='vertical', spacing=5, padding=5)
 
@@ -70,11 +74,8 @@ class ShowcaseHistoryManager(App):
         self.editor.bind(text=self.on_text_change)
         layout.add_widget(self.editor)
 
-        # Schedule initial state capture
-        Clock.schedule_once(lambda dt: self._capture_initial_state(), 0.1)
-
-        # Schedule UI updates
-        Clock.schedule_interval(self.update_ui, 0.1)
+        # Capture the initial (empty) editor state right away
+        self._capture_initial_state()
 
         return layout
 
@@ -82,22 +83,25 @@ class ShowcaseHistoryManager(App):
         """Capture the initial state of the editor."""
         self.history.add_state(self.editor.text)
         self.current_text = self.editor.text
-        self.status_text = "Initial state capture scheduled."
+        self.status_text = "Initial state captured."
+        self._refresh_ui()
 
     def on_text_change(self, instance, text):
         """Handles text changes in the editor."""
-        if text != self.current_text:
-            self.current_text = text
-            self.history.add_state(text)
+        if self._suppress_change or text == self.current_text:
+            return
+        self.current_text = text
+        self.history.commit_state_debounced(text)
 
     def do_undo(self, *args):
         """Trigger undo action."""
         Logger.info("ShowcaseHistoryManager: Undo button pressed.")
+        self.history.flush_pending()
         text = self.history.undo()
         if text is not None:
             self._set_text(text)
             self.status_text = f"Undid to state {self.history.current_index + 1}"
-            Logger.info(f"ShowcaseHistoryManager: Undid to state index {self.history.current_index}.")
+            Logger.info("ShowcaseHistoryManager: Undid to state index %s.", self.history.current_index)
         else:
             self.status_text = "Cannot Undo"
             Logger.info("ShowcaseHistoryManager: Undo not possible.")
@@ -105,42 +109,56 @@ class ShowcaseHistoryManager(App):
     def do_redo(self, *args):
         """Trigger redo action."""
         Logger.info("ShowcaseHistoryManager: Redo button pressed.")
+        self.history.flush_pending()
         text = self.history.redo()
         if text is not None:
             self._set_text(text)
             self.status_text = f"Redid to state {self.history.current_index + 1}"
-            Logger.info(f"ShowcaseHistoryManager: Redid to state index {self.history.current_index}.")
+            Logger.info("ShowcaseHistoryManager: Redid to state index %s.", self.history.current_index)
         else:
              self.status_text = "Cannot Redo"
              Logger.info("ShowcaseHistoryManager: Redo not possible.")
 
     def _set_text(self, text):
         """Set editor text programmatically without triggering on_text_change."""
-        Logger.info("ShowcaseHistoryManager: Setting text programmatically.")
-        self.editor.unbind(text=self.on_text_change)
+        self._suppress_change = True
         self.editor.text = text
         self.current_text = text
-        self.editor.bind(text=self.on_text_change)
-        Logger.info("ShowcaseHistoryManager: Programmatic text set and handler re-bound.")
-
-    def update_ui(self, dt):
-        """Update UI elements periodically based on history state."""
-        self.state_count = len(self.history.states)
-        self.state_label.text = f"States: {self.state_count}"
-
-        self.pointer_text = self.history.get_pointer()
-        self.pointer_label.text = self.pointer_text
-
-        self.undo_btn.disabled = self.history.current_index <= 0
-        self.redo_btn.disabled = self.history.current_index >= len(self.history.states) - 1
-
-        if self.history.pending_text is None and self.status_text not in ["Cannot Undo", "Cannot Redo", "Initial state capture scheduled."]:
-             if len(self.history.states) > 0:
-                 self.status_text = f"Ready. State {self.history.current_index + 1} of {len(self.history.states)}."
+        self._suppress_change = False
+        Logger.debug("ShowcaseHistoryManager: Programmatic text set.")
+
+    def _refresh_ui(self):
+        """Update UI elements whenever the history state changes, writing only values that changed."""
+        history = self.history
+        state_count = len(history.states)
+        current_index = history.current_index
+
+        if state_count != self.state_count:
+            self.state_count = state_count
+            self.state_label.text = f"States: {state_count}"
+
+        pointer_text = history.get_pointer()
+        if pointer_text != self.pointer_text:
+            self.pointer_text = pointer_text
+            self.pointer_label.text = pointer_text
+
+        undo_disabled = current_index <= 0
+        if undo_disabled != self.undo_btn.disabled:
+            self.undo_btn.disabled = undo_disabled
+        redo_disabled = current_index >= state_count - 1
+        if redo_disabled != self.redo_btn.disabled:
+            self.redo_btn.disabled = redo_disabled
+
+        status_text = self.status_text
+        if history.pending_text is None and status_text not in ["Cannot Undo", "Cannot Redo", "Initial state captured."]:
+             if state_count > 0:
+                 status_text = f"Ready. State {current_index + 1} of {state_count}."
              else:
-                 self.status_text = "Ready. No states."
-        elif self.history.pending_text is not None:
-             self.status_text = "Editing..."
+                 status_text = "Ready. No states."
+        elif history.pending_text is not None:
+             status_text = "Editing..."
+        if status_text != self.status_text:
+            self.status_text = status_text
 
     def on_stop(self):
         """Clean up when app stops."""
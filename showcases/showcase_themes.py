@@ -8,7 +8,6 @@ import re
 from pathlib import Path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from kivy.lang import Builder
 from kivy.metrics import dp, sp
 from kivy.properties import StringProperty, ColorProperty
 from kivy.utils import get_color_from_hex
@@ -22,80 +21,17 @@ from kivy.clock import Clock
 
 from core.themes import ThemeManager
 
-KV = '''
-<CodeCard>:
-    orientation: "vertical"
-    size_hint_y: None
-    height: self.minimum_height
-    padding: dp(8)
-    radius: [dp(12)]
-    elevation: 4
-    md_bg_color: app.card_bg_color
-
-    MDLabel:
-        text: root.card_title
-        font_style: "H6"
-        halign: "center"
-        theme_text_color: "Custom"
-        text_color: app.theme_cls.primary_color
-        size_hint_y: None
-        height: dp(48)
-
-    ScrollView:
-        size_hint_y: 1
-        bar_width: dp(4)
-        bar_color: app.theme_cls.primary_light
-
-        SyntaxHighlightLabel:
-            id: code_label
-            text: root.code_text
-            size_hint_y: None
-            height: self.texture_size[1]
-            text_size: self.width, None
-            padding: dp(10), dp(10)
-            halign: 'left'
-            valign: 'top'
-
-<SyntaxHighlightLabel>:
-    font_name: "RobotoMono-Regular"
-    font_size: sp(14)
-    line_height: 1.2
-    markup: True
-    theme_text_color: "Custom"
-    text_color: app.text_color
-
-MDScreen:
-    md_bg_color: app.bg_color
-
-    MDTopAppBar:
-        id: toolbar
-        title: "Theme Showcase"
-        pos_hint: {"top": 1}
-        elevation: 4
-        left_action_items: [["menu", lambda x: None]]
-        md_bg_color: app.theme_cls.primary_color
-
-    MDBoxLayout:
-        orientation: "vertical"
-        padding: dp(20)
-        spacing: dp(20)
-
-        CodeCard:
-            id: code_card
-            card_title: "Python Code Example"
-            size_hint_y: 0.7
-            size_hint_x: 1
-            padding: dp(10)
-
-        MDGridLayout:
-            id: theme_grid
-            cols: 3
-            adaptive_height: True
-            size_hint_y: None
-            height: self.minimum_height
-            spacing: dp(10)
-            padding: dp(10)
-'''
+# One alternation for every highlight rule; earlier groups win, so comments and
+# strings swallow anything that looks like a keyword inside them.
+_HIGHLIGHT_PATTERN = re.compile(
+    r'(?P<comment>#[^\n]*)'
+    r'|(?P<string>\"{3}[\s\S]*?\"{3}|\'{3}[\s\S]*?\'{3}'
+    r'|\"[^\n\"\\]*(?:\\.[^\n\"\\]*)*\"|\'[^\n\'\\]*(?:\\.[^\n\'\\]*)*\')'
+    r'|(?P<number>\b\d+\.?\d*\b)'
+    r'|(?P<defn>\b(?P<defkw>def|class)\s+(?P<defname>\w+))'
+    r'|(?P<builtin>\b(?:self|True|False|None)\b)'
+    r'|(?P<keyword>\b(?:if|else|elif|return|print|for|while|import|from|as|try|except|finally|with|async|await|lambda)\b)'
+)
 
 class SyntaxHighlightLabel(MDLabel):
     pass
@@ -105,6 +41,8 @@ class CodeCard(MDCard):
     code_text = StringProperty()
 
 class ThemeShowcaseApp(MDApp):
+    kv_file = 'showcase_themes.kv'
+
     text_color = ColorProperty()
     bg_color = ColorProperty()
     card_bg_color = ColorProperty()
@@ -112,6 +50,10 @@ class ThemeShowcaseApp(MDApp):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.theme_manager = ThemeManager()
+        # Highlighted markup keyed by (theme name, code hash), oldest first
+        self._highlight_cache = {}
+        # Theme selection buttons keyed by theme name
+        self._theme_buttons = {}
         self.current_code = '''def factorial(n):
     """Calculate factorial recursively"""
     if n == 0:
@@ -132,10 +74,20 @@ class MyClass:
         self.bg_color = get_color_from_hex("#121212")
         self.card_bg_color = get_color_from_hex("#1E1E1E")
 
+    @property
+    def current_code(self):
+        return self._current_code
+
+    @current_code.setter
+    def current_code(self, code):
+        self._current_code = code
+        self._code_hash = hash(code)
+        self._highlight_cache.clear()
+
     def build(self):
         self.theme_cls.primary_palette = "Purple"
         self.theme_cls.theme_style = "Dark"
-        return Builder.load_string(KV)
+        # The root widget comes from kv_file, which Kivy loads before build()
 
     def on_start(self):
         # Load themes and initialize UI
@@ -144,19 +96,29 @@ class MyClass:
         self.update_code_display()
 
     def load_theme_buttons(self):
-        """Populate theme selection buttons"""
+        """Populate theme selection buttons, reusing the ones already created"""
         grid = self.root.ids.theme_grid
-        grid.clear_widgets()
-        
-        for theme_name in self.theme_manager.get_theme_names():
+        theme_names = self.theme_manager.get_theme_names()
+
+        for theme_name in set(self._theme_buttons) - set(theme_names):
+            grid.remove_widget(self._theme_buttons.pop(theme_name))
+
+        for theme_name in theme_names:
+            if theme_name in self._theme_buttons:
+                continue
             btn = MDRaisedButton(
                 text=theme_name.replace("_", " ").title(),
-                on_release=lambda x, name=theme_name: self.apply_theme(name),
+                on_release=self._on_theme_button,
                 size_hint_x=None,
                 width=dp(120)
             )
+            btn.theme_name = theme_name
+            self._theme_buttons[theme_name] = btn
             grid.add_widget(btn)
 
+    def _on_theme_button(self, instance):
+        self.apply_theme(instance.theme_name)
+
     def apply_theme(self, theme_name):
         """Apply selected theme and update UI"""
         if not self.theme_manager.apply_theme(theme_name):
@@ -170,11 +132,11 @@ class MyClass:
         self.theme_cls.primary_palette = theme['primary_palette']
         self.theme_cls.theme_style = theme['theme_style']
         
-        # Update syntax colors
-        syntax = theme['syntax']
-        self.bg_color = get_color_from_hex(syntax['background'])
+        # Update syntax colors from the RGBA values ThemeManager parsed at load time
+        rgba = theme['_syntax_rgba']
+        self.bg_color = rgba['background']
         self.card_bg_color = self.bg_color
-        self.text_color = get_color_from_hex(syntax['text']['color'])
+        self.text_color = rgba['text']
         
         self.update_code_display()
 
@@ -183,7 +145,13 @@ class MyClass:
         theme = self.theme_manager.get_current_theme()
         if not theme:
             return
-            
+
+        key = (theme['theme_name'], self._code_hash)
+        cached = self._highlight_cache.get(key)
+        if cached is not None:
+            self.root.ids.code_card.code_text = cached
+            return
+
         syntax = theme['syntax']
         colors = {
             'keyword': syntax['keyword']['color'],
@@ -196,62 +164,26 @@ class MyClass:
         }
 
         highlighted = self.highlight_code(self.current_code, colors)
+        self._highlight_cache[key] = highlighted
+        if len(self._highlight_cache) > 16:
+            self._highlight_cache.pop(next(iter(self._highlight_cache)))
         self.root.ids.code_card.code_text = highlighted
 
     def highlight_code(self, code, colors):
         """Properly formatted syntax highlighting"""
-        rules = [
-            # Comments (single-line first)
-            (r'(#[^\n]*)', 'comment'),
-            
-            # Strings (triple-quoted first)
-            (r'(\"{3}[\s\S]*?\"{3}|\'{3}[\s\S]*?\'{3})', 'string'),
-            (r'(\"[^\n\"\\]*(?:\\.[^\n\"\\]*)*\"|\'[^\n\'\\]*(?:\\.[^\n\'\\]*)*\')', 'string'),
-            
-            # Numbers
-            (r'\b(\d+\.?\d*)\b', 'number'),
-            
-            # Keywords and special values
-            (r'\b(self|True|False|None)\b', 'builtin'),
-            
-            # Definitions (functions/classes)
-            (r'\b(def)\s+(\w+)', 'keyword', 'function'),
-            (r'\b(class)\s+(\w+)', 'keyword', 'class'),
-            
-            # Other keywords
-            (r'\b(if|else|elif|return|print|for|while|import|from|as|try|except|finally|with|async|await|lambda)\b', 'keyword')
-        ]
-
-        def process_line(line):
-            # Convert tabs to spaces
-            line = line.replace('\t', '    ')
-            
-            for rule in rules:
-                if len(rule) == 2:
-                    pattern, color = rule
-                    line = re.sub(
-                        pattern,
-                        lambda m: f'[color={colors[color]}]{m.group(0)}[/color]',
-                        line
-                    )
-                elif len(rule) == 3:
-                    pattern, color1, color2 = rule
-                    line = re.sub(
-                        pattern,
-                        lambda m: (
-                            f'[color={colors[color1]}]{m.group(1)}[/color] '
-                            f'[color={colors[color2]}]{m.group(2)}[/color]'
-                        ),
-                        line
-                    )
-            return line
-
-        # Process each line individually
-        lines = code.split('\n')
-        highlighted_lines = [process_line(line) for line in lines]
-        
-        # Rejoin with proper newlines
-        return '\n'.join(highlighted_lines)
+        def colorize(match):
+            kind = match.lastgroup
+            if kind == 'defn':
+                keyword = match.group('defkw')
+                name_color = colors['class' if keyword == 'class' else 'function']
+                return (
+                    f'[color={colors["keyword"]}]{keyword}[/color] '
+                    f'[color={name_color}]{match.group("defname")}[/color]'
+                )
+            return f'[color={colors[kind]}]{match.group(0)}[/color]'
+
+        # Convert tabs to spaces, then colorize everything in a single pass
+        return _HIGHLIGHT_PATTERN.sub(colorize, code.replace('\t', '    '))
 
 if __name__ == "__main__":
     ThemeShowcaseApp().run()
\ No newline at end of file
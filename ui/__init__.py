@@ -1,19 +1,24 @@
 # ui/__init__.py
 
+import importlib
+
 from kivy.logger import Logger
 
-# Import key components from modules within the ui package
-from ui.dialogs import (
-    BaseDialog,
-    ErrorDialog,
-    ConfirmDialog,
-    InfoDialog,
-    WarningDialog,
-)
-from .editor import CodeEditor
-from .console import Console
-# Import the SettingsScreen from the settings_screen module
-from .settings_screen import SettingsScreen
+# Map each exported name to the module that defines it. The modules are only
+# imported on first attribute access, so importing one submodule (or the
+# package itself) doesn't pull in every KivyMD widget.
+_LAZY_IMPORTS = {
+   # from dialogs
+   'BaseDialog': 'ui.dialogs',
+   'ErrorDialog': 'ui.dialogs',
+   'ConfirmDialog': 'ui.dialogs',
+   'InfoDialog': 'ui.dialogs',
+   'WarningDialog': 'ui.dialogs',
+
+   'CodeEditor': 'ui.editor',
+   'Console': 'ui.console',
+   'SettingsScreen': 'ui.settings_screen',
+}
 
 
 # Define what gets imported when doing 'from ui import *'
@@ -31,4 +36,18 @@ __all__ = [
 ]
 
 
-Logger.info("Initializing ui package...")
\ No newline at end of file
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
+
+
+Logger.info("Initializing ui package...")
@@ -2,8 +2,8 @@
 # Contains the Console widget definition and stream redirection.
 
 import sys
-import queue
 import threading
+from collections import deque
 from kivy.clock import Clock
 from kivy.metrics import dp
 from kivy.properties import BooleanProperty, ObjectProperty, StringProperty
@@ -12,13 +12,22 @@ from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.button import MDRaisedButton, MDIconButton
 from kivymd.uix.label import MDLabel
 from kivymd.uix.textfield import MDTextField
-from kivymd.uix.scrollview import MDScrollView
 from kivymd.app import MDApp
 from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.logger import Logger
 
 # --- Stream Redirector Classes ---
 
+# Maps a lone carriage return to a newline once CRLF pairs have been folded
+_CR_TO_LF = str.maketrans({'\r': '\n'})
+
+# Lines handed to the console per flush; the rest waits for the next frame
+MAX_LINES_PER_FRAME = 500
+
 class StdoutRedirector:
     """Redirects stdout to a Kivy Console widget."""
     # Pass the original stdout to the constructor
@@ -26,31 +35,55 @@ class StdoutRedirector:
         Logger.info("StdoutRedirector: Initialized")
         self._console = console
         self._original_stdout = original_stdout # Store original stdout
-        self._buffer = []
-        self._lock = threading.Lock()
+        # deque.append/popleft are atomic, so writer threads need no lock
+        self._buffer = deque()
+        self._partial = "" # Text after the last newline, held until its line is complete
+        # One trigger for all writes: repeated calls before it fires are coalesced
+        self._flush_trigger = Clock.create_trigger(self._process_buffer, 0.01)
 
     def write(self, text):
-        Logger.debug(f"StdoutRedirector: Received text: '{text.strip()}'")
-        with self._lock:
-            self._buffer.append(text)
-        Clock.schedule_once(self._process_buffer, 0.01)
+        self._buffer.append(text)
+        self._flush_trigger()
 
     def _process_buffer(self, dt):
-        with self._lock:
-            if not self._buffer:
-                return
-            text_to_write = "".join(self._buffer)
-            self._buffer = []
+        buffer = self._buffer
+        if not buffer:
+            return
+        # Drain only what is queued now; writes landing meanwhile stay for the next flush
+        popleft = buffer.popleft
+        text_to_write = self._partial + "".join([popleft() for _ in range(len(buffer))])
+
+        if '\r' in text_to_write:
+            text_to_write = text_to_write.replace('\r\n', '\n').translate(_CR_TO_LF)
+
+        # Hand over at most one frame's worth of lines and requeue the rest in front of newer writes
+        lines = text_to_write.split('\n', MAX_LINES_PER_FRAME)
+        if len(lines) > MAX_LINES_PER_FRAME:
+            buffer.appendleft(lines.pop())
+            self._partial = ""
+            lines.append("")
+            self._console.write('\n'.join(lines))
+            self._flush_trigger()
+            return
+
+        # Line buffering: only complete lines reach the console
+        last_newline = text_to_write.rfind('\n')
+        self._partial = text_to_write[last_newline + 1:]
+        if last_newline >= 0:
+            self._console.write(text_to_write[:last_newline + 1])
 
-        if text_to_write:
-            text_to_write = text_to_write.replace('\r\n', '\n').replace('\r', '\n')
-            self._console.write(text_to_write)
-            Logger.debug(f"StdoutRedirector: Processed buffer, wrote to console.")
+    def flush_pending(self):
+        """Writes everything buffered, including an unterminated last line (e.g. an input() prompt)."""
+        while self._buffer:
+            self._process_buffer(0)
+        if self._partial:
+            partial, self._partial = self._partial, ""
+            self._console.write(partial)
 
     def flush(self):
-        Logger.debug("StdoutRedirector: Flush called")
         # Optional: Force immediate buffer processing, scheduled to be safe
         # Clock.schedule_once(self._process_buffer, 0)
+        pass
 
     def isatty(self):
         return False
@@ -68,40 +101,32 @@ class StdinRedirector:
         Logger.info("StdinRedirector: Initialized")
         self._console = console
         self._original_stdin = original_stdin # Store original stdin
-        self._request_queue = queue.Queue()
-        self._input_queue = queue.Queue()
+        # Single-slot handoff: one line from the UI thread to the blocked readline caller
+        self._input_ready = threading.Event()
+        self._input_value = None
         self._waiting_prompt = None
 
-        self._monitor_thread = threading.Thread(target=self._monitor_requests, daemon=True)
-        self._monitor_thread.start()
-
     def readline(self):
         Logger.info("StdinRedirector: readline called - Requesting input from GUI")
         prompt = "" # Prompt handling is more complex, assuming it's printed to stdout
 
-        self._request_queue.put("REQUEST_INPUT")
+        self._input_ready.clear()
+        # Clock.schedule_once is thread-safe, so the request goes straight to the main thread
+        Clock.schedule_once(self._request_console_input, 0)
 
         Logger.info("StdinRedirector: readline blocking for input...")
-        try:
-            user_input = self._input_queue.get()
-            Logger.info(f"StdinRedirector: readline received input: '{user_input.strip()}'")
-            return user_input
-        except Exception as e:
-            Logger.error(f"StdinRedirector: Error while getting input from queue: {e}")
-            return ""
-
-    def _monitor_requests(self):
-        Logger.info("StdinRedirector: Monitor thread started")
-        while True:
-            try:
-                request = self._request_queue.get()
-                Logger.info(f"StdinRedirector: Monitor thread received request: {request}")
-                if request == "REQUEST_INPUT":
-                    Clock.schedule_once(lambda dt: self._console._request_input_from_redirector(), 0)
-                    Logger.info("StdinRedirector: Scheduled console input request")
-            except Exception as e:
-                Logger.error(f"StdinRedirector: Error in monitor thread: {e}")
-                break
+        self._input_ready.wait()
+        user_input, self._input_value = self._input_value or "", None
+        Logger.info(f"StdinRedirector: readline received input: '{user_input.strip()}'")
+        return user_input
+
+    def provide_input(self, text):
+        """Hands a line of input to the waiting readline call."""
+        self._input_value = text
+        self._input_ready.set()
+
+    def _request_console_input(self, dt):
+        self._console._request_input_from_redirector()
 
     def read(self, size=-1):
         if size == -1:
@@ -122,6 +147,27 @@ class StdinRedirector:
 
 Window.softinput_mode = 'below_target'
 
+CONSOLE_FONT = 'RobotoMono-Regular'
+CONSOLE_LINE_HEIGHT = dp(22)
+DEFAULT_TEXT_COLOR = (0.9, 0.9, 0.9, 1)
+CONSOLE_MAX_LINES = 10000 # Oldest output is dropped beyond this many lines
+
+
+class ConsoleLine(RecycleDataViewBehavior, Label):
+    """A single line of console output; instances are recycled for the visible rows only."""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.font_name = CONSOLE_FONT
+        self.halign = 'left'
+        self.valign = 'middle'
+        self.padding = (dp(10), 0)
+        self.shorten = True
+        self.bind(size=self._update_text_size)
+
+    def _update_text_size(self, instance, size):
+        self.text_size = size
+
+
 class Console(MDBoxLayout):
     waiting_for_input = BooleanProperty(False)
     input_field = ObjectProperty()
@@ -137,9 +183,20 @@ class Console(MDBoxLayout):
         self._on_input_callback = None
         self._focus_scheduled = False
         self._setup_ui()
+        # Every write asks to scroll; one trigger collapses a burst into a single scroll
+        self._scroll_trigger = Clock.create_trigger(self._do_scroll, 0.05)
         Logger.info("Console: __init__ finished")
 
-        # --- Stream Redirection Setup ---
+        # Streams are only redirected once attach_streams() is called
+        self._original_stdout = None
+        self._original_stdin = None
+        self._stdout_redirector = None
+        self._stdin_redirector = None
+
+    def attach_streams(self):
+        """Redirects sys.stdout and sys.stdin to this console."""
+        if self._stdout_redirector:
+            return
         self._original_stdout = sys.stdout
         self._original_stdin = sys.stdin
         # Pass the original streams when creating redirectors
@@ -148,7 +205,17 @@ class Console(MDBoxLayout):
         sys.stdout = self._stdout_redirector
         sys.stdin = self._stdin_redirector
         Logger.info("Console: stdout and stdin redirected")
-        # --- End Stream Redirection Setup ---
+
+    def detach_streams(self):
+        """Restores the streams replaced by attach_streams(), flushing any buffered output first."""
+        if not self._stdout_redirector:
+            return
+        self._stdout_redirector.flush_pending()
+        sys.stdout = self._original_stdout
+        sys.stdin = self._original_stdin
+        self._stdout_redirector = None
+        self._stdin_redirector = None
+        Logger.info("Console: stdout and stdin restored")
 
     def _setup_ui(self):
         Logger.info("Console: _setup_ui called")
@@ -184,23 +251,26 @@ class Console(MDBoxLayout):
 
         self.add_widget(title_bar_layout)
 
-        # Output area (fills the middle space)
-        self.output_scroll = MDScrollView(
+        # Output area (fills the middle space). Lines live in output_view.data;
+        # only the rows on screen get a ConsoleLine widget and texture.
+        self.output_view = RecycleView(
             size_hint=(1, 1),
             bar_width=dp(6),
-            do_scroll_x=False
+            do_scroll_x=False,
+            viewclass=ConsoleLine
         )
 
-        self.output_layout = MDBoxLayout(
+        self.output_layout = RecycleBoxLayout(
             orientation='vertical',
             size_hint_y=None,
             spacing=dp(2),
             padding=(dp(5), 0),
-            adaptive_height=True
+            default_size=(None, CONSOLE_LINE_HEIGHT),
+            default_size_hint=(1, None)
         )
         self.output_layout.bind(minimum_height=self.output_layout.setter('height'))
-        self.output_scroll.add_widget(self.output_layout)
-        self.add_widget(self.output_scroll)
+        self.output_view.add_widget(self.output_layout)
+        self.add_widget(self.output_view)
 
         # Input area (at the bottom)
         input_layout = BoxLayout(
@@ -228,64 +298,41 @@ class Console(MDBoxLayout):
 
         self.add_widget(input_layout)
 
-        # Bind output_layout's width to update text_size of its children labels
-        self.output_layout.bind(width=self._update_children_text_sizes)
-        Logger.info("Console: Bound output_layout.width to _update_children_text_sizes")
-
         # Initial focus set directly
         self.input_field.focus = True
         Logger.info("Console: _setup_ui finished, initial focus set")
 
-    def _update_children_text_sizes(self, instance, width):
-        Logger.info(f"Console: _update_children_text_sizes called. New width: {width}")
-        def update_sizes(_dt):
-            for label in instance.children:
-                if isinstance(label, MDLabel):
-                    label.text_size = (width, None)
-                    Logger.debug(f"Console: Updated text_size for a label to ({width}, None)")
-
-        Clock.schedule_once(update_sizes, 0)
-        Logger.debug("Console: Scheduled update_sizes for children")
-
     def write(self, text, color=None):
-        Logger.debug(f"Console: write called with text: '{text.strip()[:50]}...'")
-        label = MDLabel(
-            text=text,
-            size_hint_y=None,
-            halign="left",
-            valign="top",
-            theme_text_color="Custom",
-            text_color=color or (0.9, 0.9, 0.9, 1),
-            padding=(dp(10), dp(5)),
-        )
-        Logger.debug("Console: Label created.")
-
-        self.output_layout.add_widget(label)
-        Logger.debug("Console: Label added to output_layout")
+        if text.endswith('\n'):
+            text = text[:-1]
+        color = color or DEFAULT_TEXT_COLOR
+        data = self.output_view.data
+        data.extend({'text': line, 'color': color} for line in text.split('\n'))
+        if len(data) > CONSOLE_MAX_LINES:
+            del data[:len(data) - CONSOLE_MAX_LINES]
 
         self._scroll_to_bottom()
-        Logger.debug("Console: _scroll_to_bottom called from write")
 
     def _scroll_to_bottom(self):
-        Logger.debug("Console: _scroll_to_bottom executing")
-        def _scroll(_dt):
-            Logger.debug("Console: _scroll_to_bottom inner function executing")
-            if self.output_layout.height > self.output_scroll.height:
-                self.output_scroll.scroll_y = 0
-                Logger.debug("Console: Scrolled to bottom")
-        Clock.schedule_once(_scroll, 0.05)
-        Logger.debug("Console: _scroll_to_bottom scheduled inner function")
+        self._scroll_trigger()
+
+    def _do_scroll(self, dt):
+        if self.output_layout.height > self.output_view.height:
+            self.output_view.scroll_y = 0
 
     def _request_input_from_redirector(self):
         Logger.info("Console: Received input request from redirector")
+        # Show a pending prompt written without a trailing newline
+        if self._stdout_redirector:
+            self._stdout_redirector.flush_pending()
         prompt = "" # Prompt handling is complex, assuming it's printed to stdout
         self.request_input(prompt, self._handle_redirected_input)
 
     def _handle_redirected_input(self, text):
         Logger.info(f"Console: Handling redirected input: '{text.strip()}'")
         # Add a newline character like input() does
-        self._stdin_redirector._input_queue.put(text + '\n')
-        Logger.info("Console: Put input onto stdin redirector queue")
+        self._stdin_redirector.provide_input(text + '\n')
+        Logger.info("Console: Handed input to stdin redirector")
 
     def _handle_input(self, *args):
         Logger.info("Console: _handle_input called")
@@ -343,10 +390,6 @@ class Console(MDBoxLayout):
 
     def close_console(self, *args):
         Logger.info("Console: close_console called - Restoring stdout/stdin and stopping app")
-        # --- Restore Stream Redirection ---
-        sys.stdout = self._original_stdout
-        sys.stdin = self._original_stdin
-        Logger.info("Console: stdout and stdin restored")
-        # --- End Restore Stream Redirection ---
+        self.detach_streams()
 
         MDApp.get_running_app().stop()
\ No newline at end of file
@@ -8,33 +8,95 @@ from kivymd.uix.dialog import MDDialog
 from kivymd.uix.button import MDFlatButton, MDRectangleFlatButton
 from kivymd.uix.label import MDLabel
 from kivy.core.clipboard import Clipboard
-from kivymd.toast import toast
-from plyer import vibrator
 from kivy.logger import Logger
 from kivy.core.window import Window
 
+INFO_COLOR = "#448AFF"
+ERROR_COLOR = "#FF5252"
+CONFIRM_COLOR = "#4CAF50"
+WARNING_COLOR = "#FFC107"
+CANCEL_COLOR = "#757575"
+
+# Dialog palette parsed once instead of on every dialog construction
+_PALETTE_RGBA = {
+    hex_color: tuple(get_color_from_hex(hex_color))
+    for hex_color in (INFO_COLOR, ERROR_COLOR, CONFIRM_COLOR, WARNING_COLOR, CANCEL_COLOR)
+}
+
+
+_BUTTON_WIDTH = dp(80)
+_BUTTON_HEIGHT = dp(36)
+_BUTTON_SPACING = dp(12)
+_DIALOG_SIDE_PADDING = dp(24)
+
+
+def _sync_rect(widget, *args):
+    widget.rect.pos = widget.pos
+    widget.rect.size = widget.size
+
+
+def _fit_label_height(label, texture_size):
+    label.height = texture_size[1] + dp(16)
+
+
+def _finish_dismiss(animation, content):
+    content.owner_dialog._final_dismiss()
+
+
+# Shared animations; one Animation instance can run on several widgets at once
+_DIALOG_IN_ANIM = Animation(opacity=1, duration=0.25, t='out_quad')
+_DIALOG_OUT_ANIM = Animation(opacity=0, duration=0.18, t='out_quad')
+_DIALOG_OUT_ANIM.bind(on_complete=_finish_dismiss)
+_SEP_FADE_IN = Animation(opacity=1, duration=0.2)
+
+
+def _rgba(hex_color):
+    rgba = _PALETTE_RGBA.get(hex_color)
+    if rgba is None:
+        try:
+            rgba = tuple(get_color_from_hex(hex_color))
+        except ValueError:
+            rgba = _PALETTE_RGBA[INFO_COLOR]
+    return rgba
+
+
 class BaseDialog:
     """Dialog base with properly contained buttons"""
+
+    _vibrator = None # plyer's vibrator facade, imported on first use
+    _toast = None # kivymd's toast, imported on the first copy
     
     def __init__(self, title="", text="", buttons=None, separator_color=None, content_widget=None, include_copy=False):
         self.title = title
         self.text = text
         self.buttons = buttons or []
-        self.separator_color = separator_color or "#448AFF"
+        self.separator_color = separator_color or INFO_COLOR
+        self._separator_rgba = _rgba(self.separator_color)
         self.dialog = None
         self.content_widget = content_widget
         self.include_copy = include_copy
+        # Content layout kept across open/dismiss, rebuilt when the text or window width changes
+        self._content_cache = None
+        self._content_key = None
+        self._dialog_key = None
+        self._is_open = False
 
     def _vibrate(self, duration=0.05):
         try:
-            vibrator.vibrate(duration)
+            if BaseDialog._vibrator is None:
+                from plyer import vibrator
+                BaseDialog._vibrator = vibrator
+            BaseDialog._vibrator.vibrate(duration)
         except Exception as e:
             Logger.warning(f"Vibration failed: {str(e)}")
 
     def _copy_to_clipboard(self):
         Clipboard.copy(self.text)
         self._vibrate(0.02)
-        toast("Copied to clipboard")
+        if BaseDialog._toast is None:
+            from kivymd.toast import toast
+            BaseDialog._toast = staticmethod(toast)
+        BaseDialog._toast("Copied to clipboard")
         
     def _create_separator(self):
         sep = Widget(
@@ -42,43 +104,33 @@ class BaseDialog:
             height=dp(1),
             opacity=0,
         )
-        try:
-            color = get_color_from_hex(self.separator_color)
-        except ValueError:
-            color = get_color_from_hex("#448AFF")
-
         with sep.canvas.before:
-            Color(*color)
+            Color(*self._separator_rgba)
             sep.rect = Rectangle(pos=sep.pos, size=sep.size)
 
-        sep.bind(
-            pos=lambda s, _: setattr(s.rect, 'pos', s.pos),
-            size=lambda s, _: setattr(s.rect, 'size', s.size)
-        )
+        sep.bind(pos=_sync_rect, size=_sync_rect)
 
-        Animation(opacity=1, duration=0.2).start(sep)
+        _SEP_FADE_IN.start(sep)
         return sep
 
     def _create_copy_button(self):
         return MDRectangleFlatButton(
             text="COPY",
             size_hint=(None, None),
-            size=(dp(80), dp(36)),
+            size=(_BUTTON_WIDTH, _BUTTON_HEIGHT),
             line_color=(0, 0, 0, 0.2),
             on_release=lambda x: self._copy_to_clipboard()
         )
 
     def _create_button_box(self):
         # Calculate total button widths
-        button_widths = [dp(80) for _ in self.buttons]
-        if self.include_copy:
-            button_widths.insert(0, dp(80))  # Add COPY button width
+        button_widths = [_BUTTON_WIDTH] * (len(self.buttons) + (1 if self.include_copy else 0))
             
         total_button_width = sum(button_widths)
-        total_spacing = dp(12) * (len(button_widths) - 1)
+        total_spacing = _BUTTON_SPACING * (len(button_widths) - 1)
         
         # Calculate available width (85% of window width minus padding)
-        available_width = Window.width * 0.85 - dp(48)  # 24dp padding on each side
+        available_width = Window.width * 0.85 - 2 * _DIALOG_SIDE_PADDING
         
         # Ensure buttons fit and calculate padding
         if total_button_width + total_spacing > available_width:
@@ -88,8 +140,8 @@ class BaseDialog:
             total_button_width = sum(button_widths)
         
         button_box = BoxLayout(
-            padding=[dp(24), 0, dp(24), dp(16)],
-            spacing=dp(12),
+            padding=[_DIALOG_SIDE_PADDING, 0, _DIALOG_SIDE_PADDING, dp(16)],
+            spacing=_BUTTON_SPACING,
             size_hint_y=None,
             height=dp(48))
         
@@ -102,7 +154,9 @@ class BaseDialog:
         # Add action buttons with proper widths
         for btn, width in zip(self.buttons, button_widths[-len(self.buttons):]):
             btn.size_hint = (None, None)
-            btn.size = (width, dp(36))
+            btn.size = (width, _BUTTON_HEIGHT)
+            if btn.parent:
+                btn.parent.remove_widget(btn)
             button_box.add_widget(btn)
             
         return button_box
@@ -118,6 +172,8 @@ class BaseDialog:
         content.add_widget(self._create_separator())
 
         if self.content_widget:
+            if self.content_widget.parent:
+                self.content_widget.parent.remove_widget(self.content_widget)
             content.add_widget(self.content_widget)
         else:
             label = MDLabel(
@@ -131,44 +187,62 @@ class BaseDialog:
                 padding=(dp(8), dp(16)),
                 markup=True
             )
-            label.bind(texture_size=lambda lbl, size: setattr(lbl, 'height', size[1] + dp(16)))
+            label.bind(texture_size=_fit_label_height)
             content.add_widget(label)
 
         content.add_widget(self._create_button_box())
         content.bind(minimum_height=content.setter('height'))
+        # Lets the shared dismiss animation find the dialog that owns this content
+        content.owner_dialog = self
+        return content
+
+    def _get_content(self):
+        key = (self.text, Window.width)
+        if self._content_cache is None or self._content_key != key:
+            self._content_cache = self._create_content()
+            self._content_key = key
+        content = self._content_cache
+        # Detach from the MDDialog of a previous open
+        if content.parent:
+            content.parent.remove_widget(content)
         return content
 
     def open(self):
-        if not self.dialog:
+        if self._is_open:
+            return self
+
+        # Keep the MDDialog across dismiss/open; rebuild only if what it shows has changed
+        key = (self.title, self.text, Window.width)
+        if self.dialog is None or self._dialog_key != key:
             self.dialog = MDDialog(
                 title=f"[b]{self.title}[/b]",
                 type="custom",
-                content_cls=self._create_content(),
+                content_cls=self._get_content(),
                 buttons=[],
                 size_hint=(0.85, None),
                 elevation=8,
                 radius=[dp(12)]*4,
                 auto_dismiss=False
             )
-            
-            content = self.dialog.content_cls
-            content.opacity = 0
-            Animation(opacity=1, duration=0.25, t='out_quad').start(content)
-            self._vibrate(0.04)
-            self.dialog.open()
+            self._dialog_key = key
+
+        content = self.dialog.content_cls
+        content.opacity = 0
+        _DIALOG_IN_ANIM.start(content)
+        self._vibrate(0.04)
+        self.dialog.open()
+        self._is_open = True
         return self
 
     def dismiss(self):
-        if self.dialog and self.dialog.content_cls:
+        if self._is_open and self.dialog.content_cls:
             self._vibrate(0.02)
-            anim = Animation(opacity=0, duration=0.18, t='out_quad')
-            anim.bind(on_complete=lambda *x: self._final_dismiss())
-            anim.start(self.dialog.content_cls)
+            _DIALOG_OUT_ANIM.start(self.dialog.content_cls)
 
     def _final_dismiss(self):
-        if self.dialog:
+        if self._is_open:
             self.dialog.dismiss()
-            self.dialog = None
+            self._is_open = False
 
 
 class InfoDialog(BaseDialog):
@@ -176,10 +250,10 @@ class InfoDialog(BaseDialog):
         buttons = [MDFlatButton(
             text="OK",
             theme_text_color="Custom",
-            text_color=get_color_from_hex("#448AFF"),
+            text_color=_PALETTE_RGBA[INFO_COLOR],
             on_release=lambda x: self.dismiss()
         )]
-        super().__init__(title, text, buttons, "#448AFF", content_widget, include_copy=False)
+        super().__init__(title, text, buttons, INFO_COLOR, content_widget, include_copy=False)
 
 
 class ErrorDialog(BaseDialog):
@@ -187,10 +261,10 @@ class ErrorDialog(BaseDialog):
         buttons = [MDFlatButton(
             text="CLOSE",
             theme_text_color="Custom",
-            text_color=get_color_from_hex("#FF5252"),
+            text_color=_PALETTE_RGBA[ERROR_COLOR],
             on_release=lambda x: self.dismiss()
         )]
-        super().__init__(title, text, buttons, "#FF5252", content_widget, include_copy=True)
+        super().__init__(title, text, buttons, ERROR_COLOR, content_widget, include_copy=True)
 
 
 class ConfirmDialog(BaseDialog):
@@ -202,17 +276,17 @@ class ConfirmDialog(BaseDialog):
             MDFlatButton(
                 text=cancel_text,
                 theme_text_color="Custom",
-                text_color=get_color_from_hex("#757575"),
+                text_color=_PALETTE_RGBA[CANCEL_COLOR],
                 on_release=lambda x: self._handle_cancel()
             ),
             MDFlatButton(
                 text=confirm_text,
                 theme_text_color="Custom",
-                text_color=get_color_from_hex("#4CAF50"),
+                text_color=_PALETTE_RGBA[CONFIRM_COLOR],
                 on_release=lambda x: self._handle_confirm()
             )
         ]
-        super().__init__(title, text, buttons, "#4CAF50", content_widget, include_copy=False)
+        super().__init__(title, text, buttons, CONFIRM_COLOR, content_widget, include_copy=False)
 
     def open(self, confirm_callback=None, cancel_callback=None):
         self._confirm_callback = confirm_callback
@@ -236,7 +310,7 @@ class WarningDialog(BaseDialog):
         buttons = [MDFlatButton(
             text="GOT IT",
             theme_text_color="Custom",
-            text_color=get_color_from_hex("#FFC107"),
+            text_color=_PALETTE_RGBA[WARNING_COLOR],
             on_release=lambda x: self.dismiss()
         )]
-        super().__init__(title, text, buttons, "#FFC107", content_widget, include_copy=True)
\ No newline at end of file
+        super().__init__(title, text, buttons, WARNING_COLOR, content_widget, include_copy=True)
\ No newline at end of file
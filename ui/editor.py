@@ -16,6 +16,7 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.logger import Logger
 from kivy.graphics import Color, Rectangle
 from kivy.uix.label import Label
+from kivy.core.text import Label as CoreLabel
 
 from kivymd.app import MDApp
 from kivymd.uix.label import MDLabel
@@ -26,25 +27,36 @@ from ui.utilities.history_manager import HistoryManager
 from ui.utilities.line_number import LineNumber
 
 from kivy.clock import Clock
+from kivy.base import EventLoop
 from kivy.utils import platform
 
-# Import platform-specific keyboard handling if needed
-if platform == 'android':
-    try:
-        from jnius import autoclass
-        # Need cast for newer Android versions
-        from cast import cast # Assuming 'cast' is available or you have your own cast utility
-        Activity = autoclass('org.kivy.android.PythonActivity')
-        Rect = autoclass('android.graphics.Rect')
-        # Try casting to Activity explicitly if needed
-        activity = cast('android.app.Activity', Activity.mActivity)
-        Logger.info("CodeEditor: Loaded Android JNI keyboard classes.")
-        android_kb_detection_available = True
-    except Exception as e:
-        Logger.error(f"CodeEditor: Failed to load Android JNI keyboard classes: {e}")
-        android_kb_detection_available = False
-else:
-    android_kb_detection_available = False
+# Android keyboard detection handles: (bound getWindowVisibleDisplayFrame, reusable Rect).
+# Resolved on the first keyboard event rather than at import; False if the JNI setup failed.
+_android_jni = None
+
+
+def _ensure_android_jni():
+    """Loads the Android JNI classes needed for keyboard detection once and caches the result."""
+    global _android_jni
+    if _android_jni is None:
+        try:
+            # cast is needed for newer Android versions
+            from jnius import autoclass, cast
+            Activity = autoclass('org.kivy.android.PythonActivity')
+            Rect = autoclass('android.graphics.Rect')
+            # Try casting to Activity explicitly if needed
+            activity = cast('android.app.Activity', Activity.mActivity)
+            # Resolve the decor view and its bound method once; the JNI lookups are costly per event
+            decor_view = activity.getWindow().getDecorView()
+            _android_jni = (decor_view.getWindowVisibleDisplayFrame, Rect())
+            Logger.info("CodeEditor: Loaded Android JNI keyboard classes.")
+        except Exception as e:
+            Logger.error(f"CodeEditor: Failed to load Android JNI keyboard classes: {e}")
+            _android_jni = False
+    return _android_jni
+
+KEYBOARD_OPEN_THRESHOLD = dp(10) # Keyboard heights below this count as closed
+MIN_EDITOR_HEIGHT = dp(100)
 
 
 class CodeInput(TextInput, ThemableBehavior):
@@ -63,7 +75,12 @@ class CodeInput(TextInput, ThemableBehavior):
         '(': ')', '[': ']', '{': '}',
         '\"': '\"', "'": "'", '`': '`', '<': '>'
     }
-    AUTO_CLOSE_CHARS = {')', ']', '}', '\"', "'", '`', '>'}
+    AUTO_CLOSE_CHARS = frozenset({')', ']', '}', '\"', "'", '`', '>'})
+    # (open, close) pairs for an O(1) check when deleting between a pair
+    _PAIR_SET = frozenset(AUTO_PAIRS.items())
+
+    # Measured line heights keyed by (font_name, font_size, line_spacing), shared by all editors
+    _line_height_cache = {}
 
     parent_code_editor = ObjectProperty(None)
 
@@ -71,18 +88,29 @@ class CodeInput(TextInput, ThemableBehavior):
         super().__init__(**kwargs)
         Clock.schedule_once(self._update_line_height, 0)
         self.bind(font_name=self._update_line_height, font_size=self._update_line_height)
+        # Line count seen by the last layout update; only a change in it affects the layout
+        self._last_newline_count = self.text.count('\n')
+        # Set when the text changes, so key releases that didn't edit anything skip the history commit
+        self._history_dirty = False
         self.bind(text=self.on_text_change)
-        self.bind(cursor=self._update_last_cursor)
-
-    def _update_last_cursor(self, instance, cursor_pos):
-        self._last_cursor_col = cursor_pos[0]
-        self._last_cursor_row = cursor_pos[1]
 
     def _update_line_height(self, *args):
         if not self.font_name or self.font_size <= 0:
             self.line_height = sp(20)
             Logger.warning("CodeInput: Font name or size not set, using default line_height.")
             return
+        key = (self.font_name, float(self.font_size), float(self.line_spacing))
+        line_height = CodeInput._line_height_cache.get(key)
+        if line_height is None:
+            line_height = self._measure_line_height()
+            CodeInput._line_height_cache[key] = line_height
+        self.line_height = line_height
+
+        if self.parent_code_editor:
+             self.parent_code_editor._update_space_trigger()
+
+    def _measure_line_height(self):
+        """Renders a probe label to measure the line height of the current font."""
         try:
             temp_label = CoreLabel(font_name=self.font_name, font_size=self.font_size, text="Line1\nLine2", lines_spacing=self.line_spacing)
             temp_label.refresh()
@@ -90,69 +118,70 @@ class CodeInput(TextInput, ThemableBehavior):
                  estimated_line_height = (temp_label.texture_size[1] - self.line_spacing) / 2
                  if estimated_line_height <= 0:
                       estimated_line_height = self.font_size * 1.5
-                 self.line_height = estimated_line_height
-            else:
-                 temp_label_single = CoreLabel(font_name=self.font_name, font_size=self.font_size, text="A")
-                 temp_label_single.refresh()
-                 if temp_label_single.texture_size[1] > 0:
-                      self.line_height = temp_label_single.texture_size[1] + self.line_spacing
-                 else:
-                     self.line_height = self.font_size * 1.5 + self.line_spacing
+                 return estimated_line_height
+            temp_label_single = CoreLabel(font_name=self.font_name, font_size=self.font_size, text="A")
+            temp_label_single.refresh()
+            if temp_label_single.texture_size[1] > 0:
+                 return temp_label_single.texture_size[1] + self.line_spacing
+            return self.font_size * 1.5 + self.line_spacing
         except Exception as e:
             Logger.error(f"CodeInput: Error calculating dynamic line_height: {e}. Using heuristic + spacing.")
-            self.line_height = self.font_size * 1.5 + self.line_spacing
-
-        if self.parent_code_editor and hasattr(self.parent_code_editor, 'update_available_space'):
-             Clock.schedule_once(lambda dt: self.parent_code_editor.update_available_space(), 0)
+            return self.font_size * 1.5 + self.line_spacing
 
     def on_text_change(self, instance, value):
+        self._history_dirty = True
         if self.parent_code_editor and self.parent_code_editor.history_manager:
             self.parent_code_editor.history_manager.commit_state_debounced(value)
+        newline_count = value.count('\n')
+        if newline_count == self._last_newline_count:
+            return
+        self._last_newline_count = newline_count
         if self.parent_code_editor and self.parent_code_editor.line_number_gutter:
             self.parent_code_editor.line_number_gutter._update_preferred_width()
-        if self.parent_code_editor and hasattr(self.parent_code_editor, 'update_available_space'):
-             Clock.schedule_once(lambda dt: self.parent_code_editor.update_available_space(), 0)
+        if self.parent_code_editor:
+             self.parent_code_editor._update_space_trigger()
 
     def on_paste(self, text, *largs):
         super().on_paste(text, *largs)
-        if self.parent_code_editor and hasattr(self.parent_code_editor, 'update_available_space'):
-             Clock.schedule_once(lambda dt: self.parent_code_editor.update_available_space(), 0.1)
+        # A single-line paste can't change the line count, so the layout stays as it is
+        if self.parent_code_editor and '\n' in text:
+             self.parent_code_editor._update_space_trigger_delayed()
 
     def on_key_down(self, keyboard, keycode, text, modifiers):
-        if text in self.AUTO_PAIRS:
-            paired_char = self.AUTO_PAIRS[text]
+        auto_pairs = self.AUTO_PAIRS
+        if text in auto_pairs:
+            paired_char = auto_pairs[text]
             original_cursor_index = self.cursor_index
             super().insert_text(text + paired_char, from_undo=False)
             self.cursor = self.get_cursor_from_index(original_cursor_index + 1)
             return True
-        if keycode[1] == 'backspace' and self._last_cursor_col > 0:
-            current_text = self.text
-            cursor_index = self.cursor_index
-            if cursor_index < len(current_text) and cursor_index > 0:
-                char_before = current_text[cursor_index - 1]
-                char_after = current_text[cursor_index]
-                for open_char, close_char in self.AUTO_PAIRS.items():
-                    if char_before == open_char and char_after == close_char:
-                        self.do_backspace()
-                        self.do_backspace()
-                        return True
+        # Only the characters around the cursor matter, so read the cursor's line
+        # rather than self.text, which rebuilds the whole buffer on each access
+        col, row = self.cursor
+        line = self._lines[row] if row < len(self._lines) else ''
+        if keycode[1] == 'backspace' and 0 < col < len(line):
+            if (line[col - 1], line[col]) in self._PAIR_SET:
+                self.do_backspace()
+                self.do_backspace()
+                return True
         if text in self.AUTO_CLOSE_CHARS:
-            if self.cursor_index < len(self.text) and self.text[self.cursor_index] == text:
-                self.cursor = self.get_cursor_from_index(self.cursor_index + 1)
+            if col < len(line) and line[col] == text:
+                self.cursor = (col + 1, row)
                 return True
         return super().on_key_down(keyboard, keycode, text, modifiers)
 
     def keyboard_on_key_up(self, window, keycode):
-        if self.parent_code_editor and self.parent_code_editor.history_manager:
+        if self._history_dirty and self.parent_code_editor and self.parent_code_editor.history_manager:
+            self._history_dirty = False
             self.parent_code_editor.history_manager.commit_state_debounced(self.text)
         return super().keyboard_on_key_up(window, keycode)
 
     def on_focus(self, instance, value):
-        Logger.info(f"CodeInput: Focus changed to {value}. Window softinput_mode is handled externally.")
-        if self.parent_code_editor and hasattr(self.parent_code_editor, 'update_available_space'):
+        Logger.debug("CodeInput: Focus changed to %s.", value)
+        if self.parent_code_editor:
              # Schedule update_available_space with a slight delay after focus change
              # to allow keyboard to potentially appear and update Window.keyboard_height
-             Clock.schedule_once(lambda dt: self.parent_code_editor.update_available_space(), 0.1)
+             self.parent_code_editor._update_space_trigger_delayed()
 
 
 class CodeEditor(MDBoxLayout):
@@ -180,8 +209,19 @@ class CodeEditor(MDBoxLayout):
         self.padding = [dp(5), dp(5), dp(5), dp(0)]
 
         self.app_clock = app_clock if app_clock else Clock
+        self._last_win_size = None
+        # Vertical padding and report height rarely change, so keep their sums ready for layout
+        self._refresh_static_heights()
+        self.bind(padding=self._refresh_static_heights,
+                  report_height=self._refresh_static_heights,
+                  show_report=self._refresh_static_heights)
         self.history_manager = HistoryManager(app_clock=self.app_clock)
 
+        # Coalescing triggers: any number of requests within a frame run one layout pass
+        self._update_space_trigger = Clock.create_trigger(self.update_available_space, 0)
+        self._update_space_trigger_delayed = Clock.create_trigger(self.update_available_space, 0.1)
+
+        self._setup_retrying = False
         Clock.schedule_once(self._setup_ui, 0)
 
         # Bind to window size changes
@@ -192,15 +232,24 @@ class CodeEditor(MDBoxLayout):
 
 
         # Schedule initial space update
-        Clock.schedule_once(self.update_available_space)
+        self._update_space_trigger()
 
 
     def _setup_ui(self, dt):
         app = MDApp.get_running_app()
         if not app:
-            Logger.error("CodeEditor: MDApp not running. UI setup deferred.")
-            Clock.schedule_once(self._setup_ui, 0.1)
+            if EventLoop.status != 'started':
+                # Wait for the event loop to start instead of polling for the app
+                Logger.warning("CodeEditor: MDApp not running. UI setup deferred until the event loop starts.")
+                EventLoop.bind(on_start=self._on_event_loop_start)
+            else:
+                # on_start has already been dispatched and won't fire again; retry next frame
+                if not self._setup_retrying:
+                    Logger.warning("CodeEditor: MDApp not running. Retrying UI setup each frame.")
+                    self._setup_retrying = True
+                Clock.schedule_once(self._setup_ui, 0)
             return
+        self._setup_retrying = False
 
         if self.show_report:
             self._create_report_bar(app.theme_cls)
@@ -255,7 +304,12 @@ class CodeEditor(MDBoxLayout):
         self.add_widget(self.editor_scroll)
 
         Logger.info("CodeEditor: UI setup complete.")
-        Clock.schedule_once(self.update_available_space, 0.1)
+        self._update_space_trigger_delayed()
+
+
+    def _on_event_loop_start(self, *args):
+        EventLoop.unbind(on_start=self._on_event_loop_start)
+        self._setup_ui(0)
 
 
     def _create_report_bar(self, theme_cls):
@@ -268,20 +322,21 @@ class CodeEditor(MDBoxLayout):
         with self.report_bar.canvas.before:
             Color(*theme_cls.primary_color)
             self.bg_rect = Rectangle(pos=self.report_bar.pos, size=self.report_bar.size)
-        self.report_bar.bind(pos=self._update_bg_rect, size=self._update_bg_rect)
-        self.report_bar.add_widget(Label(text="", halign='left', color=(1, 1, 1, 1), bold=True, font_size=sp(12), text_size=(self.report_bar.width - dp(10), None)))
-        self.report_bar.add_widget(Label(text="", halign='left', color=(1, 1, 1, 1), bold=True, font_size=sp(12), text_size=(self.report_bar.width - dp(10), None)))
-        self.report_bar.bind(size=self._update_report_label_text_size)
-
-
-    def _update_bg_rect(self, instance, value):
-        self.bg_rect.pos = instance.pos
-        self.bg_rect.size = instance.size
-
-    def _update_report_label_text_size(self, instance, value):
-         for label in self.report_bar.children:
-              if isinstance(label, Label):
-                   label.text_size = (self.report_bar.width - dp(10), None)
+        # pos and size often change together; the trigger applies both once before the next frame
+        self._report_geometry_trigger = Clock.create_trigger(self._update_report_geometry, -1)
+        self.report_bar.bind(pos=self._report_geometry_trigger, size=self._report_geometry_trigger)
+        # One label for both report lines, so an update renders a single texture
+        self._report_label = Label(text="", halign='left', color=(1, 1, 1, 1), bold=True, font_size=sp(12), text_size=(self.report_bar.width - dp(10), None))
+        self._last_report_text = ""
+        self.report_bar.add_widget(self._report_label)
+
+
+    def _update_report_geometry(self, dt):
+        """Syncs the report bar background and label wrap width with the bar's geometry."""
+        report_bar = self.report_bar
+        self.bg_rect.pos = report_bar.pos
+        self.bg_rect.size = report_bar.size
+        self._report_label.text_size = (report_bar.width - dp(10), None)
 
     # Re-implementing keyboard detection using Window.bind('on_keyboard')
     def _on_keyboard(self, window, key, scancode, codepoint, modifiers):
@@ -289,20 +344,17 @@ class CodeEditor(MDBoxLayout):
         Handles the 'on_keyboard' event to detect keyboard presence and height.
         Uses platform-specific methods if necessary.
         """
-        Logger.info(f"CodeEditor: Window.on_keyboard event received. Key: {key}, Scancode: {scancode}, Codepoint: {codepoint}, Modifiers: {modifiers}")
-
         # Attempt to get keyboard height using the user's proposed logic
         kb_height = 0
-        if platform == 'android' and android_kb_detection_available:
+        android_jni = _ensure_android_jni() if platform == 'android' else None
+        if android_jni:
+             visible_frame_fn, visible_frame_rect = android_jni
              try:
                  # Re-using the Android JNI logic from the user's proposed snippet
-                 rect = Rect()
-                 view = activity.getWindow().getDecorView()
-                 view.getWindowVisibleDisplayFrame(rect)
+                 visible_frame_fn(visible_frame_rect)
                  # Calculate keyboard height as the difference between Window height and visible frame bottom
-                 kb_height_px = Window.height - rect.bottom
-                 kb_height = dp(kb_height_px) # Convert pixels to dp
-                 Logger.info(f"CodeEditor: Android JNI keyboard height detected: {kb_height_px}px ({kb_height}dp)")
+                 # Already in pixels, like Window.keyboard_height and the dp() thresholds it is compared with
+                 kb_height = Window.height - visible_frame_rect.bottom
              except Exception as e:
                  Logger.error(f"CodeEditor: Error in Android JNI keyboard height detection: {e}")
                  # Fallback to Kivy's keyboard_height if JNI fails
@@ -311,14 +363,18 @@ class CodeEditor(MDBoxLayout):
         else:
             # For other platforms or if Android JNI is not available, use Kivy's property
             kb_height = Window.keyboard_height
-            Logger.info(f"CodeEditor: Using Window.keyboard_height: {kb_height}dp")
 
 
+        # Most key presses leave the keyboard height untouched; skip the layout pass then
+        if abs(kb_height - self.keyboard_height) < dp(1):
+            return False
+
         # Update the internal keyboard_height property
         self.keyboard_height = kb_height
+        Logger.debug("CodeEditor: Keyboard height changed to %s.", kb_height)
 
         # Schedule an update for available space
-        Clock.schedule_once(self.update_available_space, 0)
+        self._update_space_trigger()
 
         # Return False to allow other widgets (like TextInput) to also receive keyboard events
         return False
@@ -326,27 +382,27 @@ class CodeEditor(MDBoxLayout):
 
     def _on_window_size(self, instance, size):
         """Handles window size changes and updates available space."""
-        Logger.info(f"CodeEditor: Window size changed to {size}. Updating available space.")
-        self.update_available_space()
+        size = tuple(size)
+        if size == self._last_win_size:
+            return
+        self._last_win_size = size
+        Logger.debug("CodeEditor: Window size changed to %s.", size)
+        self._update_space_trigger()
 
 
+    def _refresh_static_heights(self, *args):
+        """Caches the vertical padding and report bar height used by calculate_available_height."""
+        self._padding_v = float(self.padding[1] + self.padding[3])
+        self._static_report_h = float(self.report_height) if self.show_report else 0.0
+
     def calculate_available_height(self):
         """Calculates the available height for the TextInput based on window and keyboard."""
-        win_h = Window.height
-        report_h = self.report_height if self.show_report else 0
-        # Adjust buffer space calculation based on keyboard presence and size
+        kb_h = self.keyboard_height
         # Use a threshold slightly higher than 0 to avoid buffer when keyboard is not truly "open"
-        buffer = self.buffer_space if self.keyboard_height > dp(10) else 0
-
-        # Subtract report bar height, keyboard height, and buffer from window height
-        available_h = max(dp(100), win_h - report_h - self.keyboard_height - buffer) # Minimum height
-
-        # Also account for padding within the CodeEditor itself
-        available_h -= (self.padding[1] + self.padding[3])
-
-        Logger.info(f"CodeEditor: Available height calculation: Window H={win_h}, Report H={report_h}, Keyboard H={self.keyboard_height}, Buffer={buffer}, Calculated Available H={available_h}")
-
-        return available_h
+        buffer = self.buffer_space if kb_h > KEYBOARD_OPEN_THRESHOLD else 0
+        # Subtract report bar height, keyboard height, and buffer from window height (with a minimum),
+        # then the padding within the CodeEditor itself
+        return max(MIN_EDITOR_HEIGHT, Window.height - self._static_report_h - kb_h - buffer) - self._padding_v
 
 
     def update_available_space(self, *args):
@@ -359,17 +415,21 @@ class CodeEditor(MDBoxLayout):
 
         # Set the height of the ScrollView and its child (TextInput) to the calculated available height.
         # This is the core of the user's proposed approach for self-sizing.
-        self.code_input.height = available_h
-        self.editor_scroll.height = available_h
-
-        Logger.info(f"CodeEditor: Setting CodeInput height to {self.code_input.height}. ScrollView height set to {self.editor_scroll.height}")
+        # Each write dispatches a layout pass, so only write heights that actually differ.
+        resized = False
+        if abs(self.code_input.height - available_h) >= 0.5:
+            self.code_input.height = available_h
+            resized = True
+        if abs(self.editor_scroll.height - available_h) >= 0.5:
+            self.editor_scroll.height = available_h
+            resized = True
 
         # Update report if enabled
         if self.show_report:
             self._update_report()
 
-        # Trigger a line number update after space is adjusted
-        if self.line_number_gutter:
+        # Trigger a line number update after space is adjusted; the gutter redraws on the next frame
+        if resized and self.line_number_gutter:
             self.line_number_gutter._trigger_line_number_update()
 
 
@@ -380,25 +440,22 @@ class CodeEditor(MDBoxLayout):
 
         win_w, win_h = Window.size
         kb_h = self.keyboard_height # Use the internally tracked keyboard height
-        buffer_val = self.buffer_space if kb_h > dp(10) else 0
+        buffer_val = self.buffer_space if kb_h > KEYBOARD_OPEN_THRESHOLD else 0
         report_h_val = self.report_height if self.show_report else 0
         available_h = self.code_input.height
 
-        if len(self.report_bar.children) >= 2:
-            line2_label = self.report_bar.children[0]
-            line1_label = self.report_bar.children[1]
-
-            line1_label.text = (
-                f"Window: {int(win_w)}x{int(win_h)}dp | "
-                f"Editor Space: {int(available_h)}dp"
-            )
-
-            line2_label.text = (
-                f"Keyboard: {'OPEN' if kb_h > dp(10) else 'CLOSED'} "
-                f"({int(kb_h)}dp) | "
-                f"Buffer: {int(buffer_val)}dp | "
-                f"Report H: {int(report_h_val)}dp"
-            )
+        report_text = (
+            f"Window: {int(win_w)}x{int(win_h)}dp | "
+            f"Editor Space: {int(available_h)}dp\n"
+            f"Keyboard: {'OPEN' if kb_h > KEYBOARD_OPEN_THRESHOLD else 'CLOSED'} "
+            f"({int(kb_h)}dp) | "
+            f"Buffer: {int(buffer_val)}dp | "
+            f"Report H: {int(report_h_val)}dp"
+        )
+        # Re-rendering the label is the expensive part, so only do it when the text changed
+        if report_text != self._last_report_text:
+            self._last_report_text = report_text
+            self._report_label.text = report_text
 
 
     def undo(self):
@@ -1,15 +1,16 @@
 # ui/settings_screen.py
 
-from typing import Dict, Tuple, Any, Optional, List
+from functools import lru_cache, partial
+from weakref import WeakSet
+from typing import TYPE_CHECKING, Dict, Tuple, Any, Optional, List
 from kivy.clock import Clock
-from kivy.metrics import dp, sp
-from kivy.properties import ObjectProperty, StringProperty, BooleanProperty, NumericProperty
+from kivy.metrics import dp
+from kivy.properties import ObjectProperty, StringProperty
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.widget import Widget
-from kivy.uix.screenmanager import ScreenManager
+from kivy.uix.screenmanager import SwapTransition
 
 from kivymd.app import MDApp
-from kivymd.theming import ThemableBehavior # Keep this if ThemableBehavior is used by other classes imported here
 from kivymd.uix.screen import MDScreen
 from kivymd.uix.toolbar import MDTopAppBar
 from kivymd.uix.boxlayout import MDBoxLayout
@@ -18,19 +19,69 @@ from kivymd.uix.button import MDIconButton
 from kivymd.uix.textfield import MDTextField
 from kivymd.uix.selectioncontrol import MDSwitch
 from kivymd.uix.scrollview import MDScrollView
-from kivymd.uix.list import OneLineListItem, IRightBodyTouch
-from kivymd.uix.menu import MDDropdownMenu
-from kivymd.uix.behaviors import RectangularRippleBehavior # Keep this if used by other classes imported here
+from kivymd.uix.list import OneLineListItem # viewclass of the dropdown items
 
 # Import ConfigManager and ThemeManager
 from core.config_manager import ConfigManager
 from core.themes import ThemeManager, get_registered_font_names
 
-# Import dialogs for confirmation
-from .dialogs import ConfirmDialog
+if TYPE_CHECKING:
+    # Imported for real on first use: the menu module when a dropdown is built,
+    # the dialogs when a reset is confirmed
+    from kivymd.uix.menu import MDDropdownMenu
 
 from kivy.logger import Logger
 
+# theme_cls attributes a theme's kivymd_settings may set
+_KIVYMD_THEME_KEYS = frozenset({'primary_palette', 'primary_hue', 'accent_palette', 'theme_style'})
+
+# Shared transition for leaving the settings screen; the ScreenManager runs one transition at a time
+_CLOSE_TRANSITION = SwapTransition()
+
+SETTING_COMMIT_DELAY = 0.35 # Seconds a setting change waits for further changes before it is committed
+AUTO_SAVE_INTERVAL = 1.0 # Seconds auto-save waits so a burst of committed changes is written once
+
+# Setting row metrics, shared by every row, dropdown caller and menu item
+_ROW_HEIGHT = dp(48)
+_ROW_PADDING = (dp(10), 0)
+_ROW_SPACING = dp(10)
+_ROW_LABEL_WIDTH = dp(150)
+
+# theme_cls properties that change how a ThemeAwareDropdownCaller should be colored
+_CALLER_THEME_PROPERTIES = ('theme_style', 'primary_palette', 'accent_palette', 'primary_hue')
+
+def _to_int(value: Any) -> int:
+    # Handle potential empty string from textfield before conversion
+    if isinstance(value, str) and value.strip() == "":
+        return 0 # Or handle as None/error depending on desired behavior
+    return int(value)
+
+
+def _to_float(value: Any) -> float:
+    if isinstance(value, str) and value.strip() == "":
+        return 0.0
+    return float(value)
+
+
+# Converters from widget values to setting types; anything else (including dropdown values) becomes str.
+# MDSwitch provides boolean values directly.
+_SETTING_CONVERTERS = {bool: bool, int: _to_int, float: _to_float}
+
+
+# Which list of names each dropdown setting shows; the font menus share one list
+_DROPDOWN_LISTS = {
+    ("theme", "current_theme"): "themes",
+    ("editor", "font_name"): "fonts",
+    ("console", "font_name"): "fonts",
+}
+
+
+@lru_cache(maxsize=8)
+def _menu_width_mult(names: Tuple[str, ...]) -> int:
+    """Dropdown width_mult for a list of names; the editor and console font menus share one scan."""
+    return max(4, max(map(len, names), default=0) // 5)
+
+
 # --- New Custom Dropdown Caller Widget (Manual Theme Handling) ---
 class ThemeAwareDropdownCaller(MDBoxLayout):
     """
@@ -43,6 +94,18 @@ class ThemeAwareDropdownCaller(MDBoxLayout):
     # Property to hold the hint text (e.e., "Select Font")
     hint_text = StringProperty("")
 
+    # Live callers, recolored by one shared set of theme_cls bindings
+    _instances = WeakSet()
+    _bound_theme_cls = None # theme_cls the shared bindings are attached to
+    # A theme switch can change several theme_cls properties in one frame; recolor once for all of them
+    _recolor_trigger = None
+
+    @classmethod
+    def _recolor_all(cls, *args):
+        """Recolors every live caller after theme_cls changes."""
+        for caller in list(cls._instances):
+            caller._update_theme_colors()
+
     # Define the required default handlers for the registered events
     def on_press(self, *args):
         """Default handler for the custom 'on_press' event."""
@@ -56,56 +119,50 @@ class ThemeAwareDropdownCaller(MDBoxLayout):
     # These methods are called automatically when the 'text' or 'hint_text' properties change
     def on_text(self, instance, value):
         """Updates the label's text when the 'text' property changes."""
-        Logger.info(f"ThemeAwareDropdownCaller: on_text called. value='{value}', self.hint_text='{self.hint_text}'")
         # Update the label's text to the new value if it's not empty, otherwise show hint text
-        if hasattr(self, 'label') and self.label is not None:
-             self.label.text = value if value else self.hint_text
-             # Determine label text color based on whether text is set or hint is shown
-             if value: # If text is set, use primary color
-                  self.label.theme_text_color = "Primary"
-             else: # If text is empty (showing hint), use hint color
-                  self.label.theme_text_color = "Hint"
-             Logger.info(f"ThemeAwareDropdownCaller: Label text updated to '{self.label.text}'")
+        if self.label is not None:
+             display_text = value if value else self.hint_text
+             # Reloading settings often reassigns the same value; skip the label writes then
+             if self.label.text == display_text and self.label.theme_text_color == ("Primary" if value else "Hint"):
+                  return
+             self.label.text = display_text
+             self._apply_label_color(bool(value))
         else:
              Logger.warning("ThemeAwareDropdownCaller: on_text called, but self.label is not available.")
 
 
     def on_hint_text(self, instance, value):
         """Updates the label's text if the 'text' property is empty and 'hint_text' changes."""
-        Logger.info(f"ThemeAwareDropdownCaller: on_hint_text called. value='{value}', self.text='{self.text}'")
         # Update the label's text to the hint text only if the 'text' property is empty
         if not self.text:
-             if hasattr(self, 'label') and self.label is not None:
+             if self.label is not None:
+                  if self.label.text == value and self.label.theme_text_color == "Hint":
+                       return
                   self.label.text = value
-                  self.label.theme_text_color = "Hint" # Ensure hint color is applied
-                  Logger.info(f"ThemeAwareDropdownCaller: Label text updated to hint '{self.label.text}'")
+                  self._apply_label_color(False) # Ensure hint color is applied
              else:
                   Logger.warning("ThemeAwareDropdownCaller: on_hint_text called, but self.label is not available.")
 
 
+    def _apply_label_color(self, has_text):
+        """Colors the label as a value (Primary) or as the hint text (Hint)."""
+        self.label.theme_text_color = "Primary" if has_text else "Hint"
+
     # Method to update colors based on the current theme
     def _update_theme_colors(self, instance=None, value=None):
         """Manually updates the colors of the label and icon based on the current theme."""
         try:
-            app = MDApp.get_running_app()
-            if app and hasattr(app, 'theme_cls'):
-                theme_cls = app.theme_cls
+            if self.label is not None:
+                 self._apply_label_color(bool(self.text))
+            else:
+                 Logger.warning("ThemeAwareDropdownCaller: Could not update label theme color, self.label not available.")
 
-                # Determine label text color based on whether text is set or hint is shown
-                if hasattr(self, 'label') and self.label is not None:
-                     if self.text: # If text is set, use primary color
-                          self.label.theme_text_color = "Primary"
-                     else: # If text is empty (showing hint), use hint color
-                          self.label.theme_text_color = "Hint"
-                else:
-                     Logger.warning("ThemeAwareDropdownCaller: Could not update label theme color, self.label not available.")
 
-
-                # Determine icon color - often based on primary or accent palette
-                if hasattr(self, 'icon') and self.icon is not None:
-                     self.icon.theme_text_color = "Primary" # Or "Accent" if preferred
-                else:
-                     Logger.warning("ThemeAwareDropdownCaller: Could not update icon theme color, self.icon not available.")
+            # Determine icon color - often based on primary or accent palette
+            if self.icon is not None:
+                 self.icon.theme_text_color = "Primary" # Or "Accent" if preferred
+            else:
+                 Logger.warning("ThemeAwareDropdownCaller: Could not update icon theme color, self.icon not available.")
 
 
         except Exception as e:
@@ -113,15 +170,18 @@ class ThemeAwareDropdownCaller(MDBoxLayout):
 
 
     def __init__(self, hint_text="", **kwargs):
+        # Created below; None until then so the property handlers need just an `is None` check
+        self.label = None
+        self.icon = None
         super().__init__(**kwargs)
         # Set hint_text first so on_hint_text might be called if text is initially empty
         self.hint_text = hint_text
 
         self.orientation = "horizontal"
         self.size_hint_y = None
-        self.height = dp(48) # Standard height for a setting row widget
-        self.padding = dp(10), 0 # Standard padding
-        self.spacing = dp(10) # Standard spacing
+        self.height = _ROW_HEIGHT # Standard height for a setting row widget
+        self.padding = _ROW_PADDING # Standard padding
+        self.spacing = _ROW_SPACING # Standard spacing
 
 
         # === CREATE THE LABEL AND ICON WIDGETS FIRST ===
@@ -135,7 +195,7 @@ class ThemeAwareDropdownCaller(MDBoxLayout):
         self.icon = MDIconButton(
             icon="menu-down",
             size_hint_x=None,
-            width=dp(48),
+            width=_ROW_HEIGHT,
             theme_text_color="Primary" # Initial icon color
         )
 
@@ -154,19 +214,22 @@ class ThemeAwareDropdownCaller(MDBoxLayout):
         # --- Manual Theme Binding ---
         app = MDApp.get_running_app()
         if app and hasattr(app, 'theme_cls'):
-            app.theme_cls.bind(
-                theme_style=self._update_theme_colors,
-                primary_palette=self._update_theme_colors,
-                accent_palette=self._update_theme_colors,
-                primary_hue=self._update_theme_colors
-            )
+            theme_cls = app.theme_cls
+            cls = ThemeAwareDropdownCaller
+            if cls._bound_theme_cls is not theme_cls:
+                if cls._recolor_trigger is None:
+                    cls._recolor_trigger = Clock.create_trigger(cls._recolor_all, 0)
+                for name in _CALLER_THEME_PROPERTIES:
+                    theme_cls.fbind(name, cls._recolor_trigger)
+                cls._bound_theme_cls = theme_cls
+            cls._instances.add(self)
             self._update_theme_colors() # Initial call
 
 
     # Override touch methods to dispatch custom events and consume touch
     def on_touch_down(self, touch):
         if self.collide_point(*touch.pos):
-            Logger.info(f"ThemeAwareDropdownCaller: Touch Down on {self.hint_text or 'Dropdown Caller'}.")
+            Logger.debug("ThemeAwareDropdownCaller: Touch Down on %s.", self.hint_text)
             self.dispatch('on_press')
             touch.grab(self)
             return True
@@ -175,7 +238,7 @@ class ThemeAwareDropdownCaller(MDBoxLayout):
 
     def on_touch_up(self, touch):
         if touch.grab_current == self:
-            Logger.info(f"ThemeAwareDropdownCaller: Touch Up on {self.hint_text or 'Dropdown Caller'}.")
+            Logger.debug("ThemeAwareDropdownCaller: Touch Up on %s.", self.hint_text)
             touch.ungrab(self)
             if self.collide_point(*touch.pos):
                 self.dispatch('on_release')
@@ -185,22 +248,10 @@ class ThemeAwareDropdownCaller(MDBoxLayout):
 
 
     def on_parent(self, instance, value):
-        """Handle parent changes to unbind from theme_cls when removed."""
-        # Ensure unbinding happens *before* super call removes the widget
+        """Handle parent changes to stop theme updates when removed."""
         if value is None:
-             Logger.info("ThemeAwareDropdownCaller: Widget removed from parent. Unbinding theme_cls.")
-             app = MDApp.get_running_app()
-             if app and hasattr(app, 'theme_cls'):
-                  # Ensure the bound method exists before unbinding
-                  if hasattr(self, '_update_theme_colors'):
-                       app.theme_cls.unbind(
-                            theme_style=self._update_theme_colors,
-                            primary_palette=self._update_theme_colors,
-                            accent_palette=self._update_theme_colors,
-                            primary_hue=self._update_theme_colors
-                       )
-                  else:
-                       Logger.warning("ThemeAwareDropdownCaller: _update_theme_colors method not found for unbinding.")
+             Logger.info("ThemeAwareDropdownCaller: Widget removed from parent. Stopping theme updates.")
+             ThemeAwareDropdownCaller._instances.discard(self)
 
         # REMOVED: super().on_parent(instance, value) # Corrected: Remove this line causing AttributeError
 
@@ -214,6 +265,15 @@ class SettingsScreen(MDScreen):
     # ConfigManager will now be passed in __init__ and manage paths internally
     config_manager = ObjectProperty(None)
 
+    # (event, handler method) pairs bound for each setting widget type, looked up by exact type
+    _WIDGET_BINDINGS = {
+        MDSwitch: (('active', '_on_switch_active'),),
+        # Regular text fields save on Enter and on focus loss
+        MDTextField: (('on_text_validate', '_on_textfield_validate'), ('focus', '_on_textfield_focus')),
+        # The custom on_release event of the dropdown caller
+        ThemeAwareDropdownCaller: (('on_release', '_on_dropdown_caller_release'),),
+    }
+
     # Removed theme_manager attribute - instantiated locally
 
     # Removed DEFAULT_CONFIG_PATH - ConfigManager handles paths
@@ -226,21 +286,52 @@ class SettingsScreen(MDScreen):
         # Accept the ConfigManager instance from the caller
         self.config_manager = config_manager
 
+        # The screen is built inside a running app, so resolve its theme_cls once
+        app = MDApp.get_running_app()
+        self._theme_cls = getattr(app, 'theme_cls', None)
+        self._bg_color_style = None
+        self._bg_color = None
+
         # Instantiate ThemeManager locally
         self.theme_manager = ThemeManager()
-        self.theme_manager.load_themes_from_json() # Load themes on init
+        # Themes are read from disk on first use (see _ensure_themes_loaded), not while building the screen
+        self._themes_loaded = False
 
         # Initialize storage for UI components
         self._setting_widgets: Dict[Tuple[str, str], Any] = {}
+        # The MDTextField subset of the setting widgets, checked for pending edits on save
+        self._text_field_widgets: List[Tuple[str, str, MDTextField]] = []
         # Updated type hint to use the new caller widget
         self._dropdown_callers: Dict[Tuple[str, str], ThemeAwareDropdownCaller] = {}
-        self._dropdown_menus: Dict[Tuple[str, str], MDDropdownMenu] = {}
+        self._dropdown_menus: Dict[Tuple[str, str], 'MDDropdownMenu'] = {}
+        # Dropdown items per list of names: (names they were built from, items, width_mult)
+        self._menu_items_cache: Dict[str, Tuple[Tuple[str, ...], List[Dict], int]] = {}
+        # Setting whose dropdown was opened last; receives item selections
+        self._open_dropdown_key: Optional[Tuple[str, str]] = None
+        # Value type of each setting, inferred from the config on its first change
+        self._setting_types: Dict[Tuple[str, str], type] = {}
+        # Converted values waiting to be committed, and their scheduled commits
+        self._pending_changes: Dict[Tuple[str, str], Any] = {}
+        self._debounce_events: Dict[Tuple[str, str], Any] = {}
+        # Auto-save batching: the config is written at most once per AUTO_SAVE_INTERVAL
+        self._config_dirty = False
+        self._save_event = None
+        # Set while config values are written into the widgets, so their change handlers stay quiet
+        self._loading = False
+        # fbind doesn't de-duplicate, so track whether the menu color update is bound
+        self._menu_colors_bound = False
+        self._menu_colors_trigger = Clock.create_trigger(self._update_dropdown_menu_colors, 0)
+        # Theme re-applies requested within one frame (e.g. by a reset) run once
+        self._theme_reapply_trigger = Clock.create_trigger(self._do_theme_reapply, 0)
 
         self._setup_ui()
+        self._bind_menu_colors()
         # Bind to on_enter to load settings when screen becomes active
-        self.bind(on_enter=self._load_settings_into_ui)
+        self.fbind('on_enter', self._load_settings_into_ui)
         # Bind to on_pre_leave to dismiss dropdowns before leaving
-        self.bind(on_pre_leave=self._dismiss_dropdowns)
+        self.fbind('on_pre_leave', self._dismiss_dropdowns)
+        # Don't leave changes uncommitted when navigating away
+        self.fbind('on_pre_leave', self._flush_pending_settings)
 
 
     def _setup_ui(self) -> None:
@@ -261,14 +352,14 @@ class SettingsScreen(MDScreen):
         """Configures the top app bar, including the reset button."""
         self.toolbar = MDTopAppBar(title="Settings")
         self.toolbar.left_action_items = [
-            ["arrow-left", lambda x: self._close_settings()]
+            ["arrow-left", self._close_settings]
         ]
         # Added a 'Reset' icon button to the right action items
         self.toolbar.right_action_items = [
-            ["content-save", lambda x: self._save_settings()],
-            ["reload", lambda x: self._reload_settings()],
+            ["content-save", self._save_settings],
+            ["reload", self._reload_settings],
             # Add the reset button that triggers the confirmation dialog
-            ["undo", lambda x: self._show_reset_confirmation()] # Using 'undo' icon for reset
+            ["undo", self._show_reset_confirmation] # Using 'undo' icon for reset
         ]
         self.main_layout.add_widget(self.toolbar)
 
@@ -313,6 +404,7 @@ class SettingsScreen(MDScreen):
     def _clear_ui_references(self) -> None:
         """Clears all references to UI components."""
         self._setting_widgets.clear()
+        self._text_field_widgets.clear()
         self._dropdown_callers.clear()
 
         # Properly clean up existing dropdown menus
@@ -470,15 +562,15 @@ class SettingsScreen(MDScreen):
         row_layout = BoxLayout(
             orientation="horizontal",
             size_hint_y=None,
-            height=dp(48),
-            spacing=dp(10),
-            padding=(dp(10), 0)
+            height=_ROW_HEIGHT,
+            spacing=_ROW_SPACING,
+            padding=_ROW_PADDING
         )
 
         row_layout.add_widget(MDLabel(
             text=label_text,
             size_hint_x=None,
-            width=dp(150),
+            width=_ROW_LABEL_WIDTH,
             valign="center",
             markup=True
         ))
@@ -486,102 +578,74 @@ class SettingsScreen(MDScreen):
         row_layout.add_widget(setting_widget)
         self.settings_content_layout.add_widget(row_layout)
 
+        # The setting this widget edits, read back by the shared handlers below
+        setting_widget._section = section
+        setting_widget._key = key
+        if isinstance(setting_widget, MDTextField):
+            self._text_field_widgets.append((section, key, setting_widget))
+
         # Set up appropriate bindings based on widget type
-        if isinstance(setting_widget, MDSwitch):
-            setting_widget.bind(
-                active=lambda instance, value: self._on_setting_changed(section, key, value)
-            )
-        elif isinstance(setting_widget, MDTextField):
-            # Regular text fields
-            setting_widget.bind(
-                on_text_validate=lambda instance: self._on_setting_changed(section, key, instance.text)
-            )
-            setting_widget.bind(
-                focus=lambda instance, focus: self._on_setting_textfield_focus(instance, focus, section, key)
-            )
-        elif isinstance(setting_widget, ThemeAwareDropdownCaller):
-             # Bind the custom on_release event for the new dropdown caller
-             setting_widget.bind(
-                 on_release=lambda instance: self._open_dropdown(section, key)
-             )
+        for event_name, handler_name in self._WIDGET_BINDINGS.get(type(setting_widget), ()):
+            setting_widget.fbind(event_name, getattr(self, handler_name))
 
 
         return setting_widget
 
     def _initialize_dropdowns(self) -> None:
-        """Initializes MDDropdownMenu instances for settings that use them."""
-        Logger.debug("SettingsScreen: Initializing dropdown menus")
-
-        # Initialize theme dropdown - using the locally instantiated theme_manager
-        theme_names = self.theme_manager.get_available_themes()
-        theme_name_caller = self._dropdown_callers.get(("theme", "current_theme"))
-
-        if theme_name_caller:
-             theme_items = [
-                 {
-                     "viewclass": "OneLineListItem",
-                     "text": theme_name,
-                     "height": dp(48),
-                     "on_release": lambda x=theme_name: self._select_dropdown_item("theme", "current_theme", x),
-                 } for theme_name in theme_names
-             ]
-
-             self._create_or_update_dropdown(
-                 ("theme", "current_theme"),
-                 theme_name_caller,
-                 theme_items,
-                 max(4, len(max(theme_names, key=len)) // 5) if theme_names else 4
-             )
-
-
-        # Initialize font dropdowns - getting font names directly
-        font_names = get_registered_font_names()
-        editor_font_name_caller = self._dropdown_callers.get(("editor", "font_name"))
-        console_font_name_caller = self._dropdown_callers.get(("console", "font_name"))
-
-
-        if editor_font_name_caller:
-             font_items = [
-                 {
-                     "viewclass": "OneLineListItem",
-                     "text": font_name,
-                     "height": dp(48),
-                     "on_release": lambda x=font_name: self._select_dropdown_item("editor", "font_name", x),
-                 } for font_name in font_names
-             ]
-
-             self._create_or_update_dropdown(
-                 ("editor", "font_name"),
-                 editor_font_name_caller,
-                 font_items,
-                 max(4, len(max(font_names, key=len)) // 5) if font_names else 4
-             )
-
-        if console_font_name_caller:
-             font_items = [
-                 {
-                     "viewclass": "OneLineListItem",
-                     "text": font_name,
-                     "height": dp(48),
-                     "on_release": lambda x=font_name: self._select_dropdown_item("console", "font_name", x),
-                 } for font_name in font_names
-             ]
-
-             self._create_or_update_dropdown(
-                 ("console", "font_name"),
-                 console_font_name_caller,
-                 font_items,
-                 max(4, len(max(font_names, key=len)) // 5) if font_names else 4
-             )
+        """
+        Refreshes the dropdown menus built so far with the current themes/fonts.
+        Menus that haven't been opened yet are built on first open by _open_dropdown.
+        """
+        Logger.debug("SettingsScreen: Refreshing dropdown menus")
+        for setting_key in list(self._dropdown_menus):
+            self._build_dropdown(setting_key)
+
+    def _dropdown_names(self, list_name: str) -> List[str]:
+        """Returns the names in one of the dropdown lists ("themes" or "fonts")."""
+        if list_name == "themes":
+            # Theme names come from the locally instantiated theme_manager
+            self._ensure_themes_loaded()
+            return self.theme_manager.get_available_themes()
+        return get_registered_font_names()
+
+    def _build_dropdown(self, setting_key: Tuple[str, str]) -> Optional['MDDropdownMenu']:
+        """Creates or updates the dropdown menu for a setting and returns it."""
+        caller = self._dropdown_callers.get(setting_key)
+        if not caller:
+            return None
+        items, width_mult = self._get_menu_items(_DROPDOWN_LISTS[setting_key])
+        self._create_or_update_dropdown(setting_key, caller, items, width_mult)
+        return self._dropdown_menus.get(setting_key)
+
+    def _get_menu_items(self, list_name: str) -> Tuple[List[Dict], int]:
+        """
+        Returns the dropdown items and width_mult for a list of names.
+        They are built once, shared by every menu showing that list,
+        and reused until the names change.
+        """
+        names = tuple(self._dropdown_names(list_name))
+        cached = self._menu_items_cache.get(list_name)
+        if cached is not None and cached[0] == names:
+            return cached[1], cached[2]
+
+        # Items don't name their setting; a selection goes to whichever menu is open
+        items = [
+            {
+                "viewclass": "OneLineListItem",
+                "text": name,
+                "height": _ROW_HEIGHT,
+                "on_release": partial(self._select_open_dropdown_item, name),
+            } for name in names
+        ]
+        width_mult = _menu_width_mult(names)
+        self._menu_items_cache[list_name] = (names, items, width_mult)
+        return items, width_mult
 
 
     def _create_or_update_dropdown(self, key: Tuple[str, str], caller: Widget,
                                   items: List[Dict], width_mult: int) -> None:
         """Creates or updates a dropdown menu."""
-        # Use MDApp.get_running_app() to access the theme_cls
-        app = MDApp.get_running_app()
-        bg_color = app.theme_cls.bg_dark if app.theme_cls.theme_style == "Dark" else app.theme_cls.bg_light
-
+        bg_color = self._menu_bg_color()
 
         if key in self._dropdown_menus and self._dropdown_menus[key].caller == caller:
             # Menu exists and caller is the same, just update items and width
@@ -593,6 +657,7 @@ class SettingsScreen(MDScreen):
             if key in self._dropdown_menus and self._dropdown_menus[key]:
                 self._dropdown_menus[key].dismiss()
 
+            from kivymd.uix.menu import MDDropdownMenu
             self._dropdown_menus[key] = MDDropdownMenu(
                 caller=caller,
                 items=items,
@@ -602,9 +667,6 @@ class SettingsScreen(MDScreen):
                 on_dismiss=self._on_menu_dismiss,
                 background_color=bg_color # Set initial color
             )
-            # Bind to theme_cls changes to update dropdown background color
-            if app and hasattr(app, 'theme_cls'):
-                 app.theme_cls.bind(theme_style=self._update_dropdown_menu_colors)
 
     # Removed _handle_dropdown_caller_touch as the new widget handles its own touch
 
@@ -614,45 +676,63 @@ class SettingsScreen(MDScreen):
 
     def _open_dropdown(self, section: str, key: str) -> None:
         """Opens the dropdown menu associated with a setting."""
-        Logger.debug(f"SettingsScreen: Opening dropdown for '{section}.{key}'")
-        dropdown_menu = self._dropdown_menus.get((section, key))
+        Logger.debug("SettingsScreen: Opening dropdown for '%s.%s'", section, key)
+        setting_key = (section, key)
+        dropdown_menu = self._dropdown_menus.get(setting_key)
+        if dropdown_menu is None:
+            dropdown_menu = self._build_dropdown(setting_key)
         if dropdown_menu:
+            self._open_dropdown_key = setting_key
             dropdown_menu.open()
 
+    def _select_open_dropdown_item(self, text: str) -> None:
+        """Handler for dropdown items; applies the selection to the setting whose menu is open."""
+        if self._open_dropdown_key is not None:
+            section, key = self._open_dropdown_key
+            self._select_dropdown_item(section, key, text)
+
     def _select_dropdown_item(self, section: str, key: str, text: str) -> None:
         """Handler for selecting an item from a dropdown menu."""
-        Logger.debug(f"SettingsScreen: Selected '{text}' for '{section}.{key}'")
-
-        caller_widget = self._dropdown_callers.get((section, key))
-        if caller_widget:
-            # For the new ThemeAwareDropdownCaller, set its 'text' property
-            caller_widget.text = text
+        Logger.debug("SettingsScreen: Selected '%s' for '%s.%s'", text, section, key)
 
+        # The item came from this menu, and the menu knows its caller, so one lookup covers both
         dropdown_menu = self._dropdown_menus.get((section, key))
         if dropdown_menu:
+            # For the new ThemeAwareDropdownCaller, set its 'text' property
+            dropdown_menu.caller.text = text
             dropdown_menu.dismiss()
 
-        self._on_setting_changed(section, key, text)
+        # A pick from a menu is deliberate, so commit it (and apply a theme) right away
+        self._on_setting_changed(section, key, text, immediate=True)
 
-        if section == "theme" and key == "current_theme":
-            self._apply_theme_settings(text)
+    def _ensure_themes_loaded(self) -> None:
+        """Loads the theme files the first time theme data is needed."""
+        if not self._themes_loaded:
+            self.theme_manager.load_themes_from_json()
+            self._themes_loaded = True
+
+    def _do_theme_reapply(self, *args) -> None:
+        """Applies the configured theme once for all re-applies requested since the last frame."""
+        current_theme = self.config_manager.get_setting("theme", "current_theme", "default")
+        self._apply_theme_settings(current_theme)
 
     def _apply_theme_settings(self, theme_name: str) -> None:
         """Applies the selected theme settings to the KivyMD app."""
-        Logger.debug(f"SettingsScreen: Applying theme settings for '{theme_name}'")
+        Logger.debug("SettingsScreen: Applying theme settings for '%s'", theme_name)
         # Use the locally instantiated theme_manager
+        self._ensure_themes_loaded()
         theme_data = self.theme_manager.get_theme_settings(theme_name)
         if not theme_data:
             Logger.warning(f"SettingsScreen: No theme data found for '{theme_name}'")
             return
 
         kivymd_settings = theme_data.get('kivymd_settings', {})
-        app = MDApp.get_running_app()
-        if hasattr(app, 'theme_cls'):
+        theme_cls = self._theme_cls
+        if kivymd_settings and theme_cls is not None:
             for attr, value in kivymd_settings.items():
-                if hasattr(app.theme_cls, attr):
-                    setattr(app.theme_cls, attr, value)
-                    Logger.debug(f"SettingsScreen: Set theme_cls.{attr} = '{value}'")
+                if attr in _KIVYMD_THEME_KEYS:
+                    setattr(theme_cls, attr, value)
+                    Logger.debug("SettingsScreen: Set theme_cls.%s = '%s'", attr, value)
 
         # Update dropdown menu colors (this binding is now handled in _create_or_update_dropdown)
         # self._update_dropdown_menu_colors()
@@ -660,17 +740,35 @@ class SettingsScreen(MDScreen):
 
     def _update_dropdown_menu_colors(self, *args) -> None:
         """Updates all dropdown menu colors to match current theme."""
-        app = MDApp.get_running_app()
-        if not hasattr(app, 'theme_cls'):
+        if self._theme_cls is None:
              return
 
-        bg_color = app.theme_cls.bg_dark if app.theme_cls.theme_style == "Dark" else app.theme_cls.bg_light
-        Logger.debug(f"SettingsScreen: Updating dropdown menu colors to {bg_color}")
+        bg_color = self._menu_bg_color()
+        Logger.debug("SettingsScreen: Updating dropdown menu colors to %s", bg_color)
         for menu in self._dropdown_menus.values():
             if menu and hasattr(menu, 'background_color'):
                  menu.background_color = bg_color
 
 
+    def _menu_bg_color(self):
+        """Dropdown background for the current theme_style, looked up again only when the style changes."""
+        theme_cls = self._theme_cls
+        if theme_cls is None:
+            return None
+        style = theme_cls.theme_style
+        if style != self._bg_color_style:
+            self._bg_color_style = style
+            self._bg_color = theme_cls.bg_dark if style == "Dark" else theme_cls.bg_light
+        return self._bg_color
+
+
+    def _bind_menu_colors(self) -> None:
+        """Follows theme_style changes with the dropdown menu colors; bound at most once at a time."""
+        if self._theme_cls is not None and not self._menu_colors_bound:
+            self._theme_cls.fbind('theme_style', self._menu_colors_trigger)
+            self._menu_colors_bound = True
+
+
     def _dismiss_dropdowns(self, *args) -> None:
         """Dismisses any open dropdown menus when the screen is left."""
         Logger.debug("SettingsScreen: Dismissing all dropdowns")
@@ -678,80 +776,138 @@ class SettingsScreen(MDScreen):
             if menu and menu.parent:
                 menu.dismiss()
         # Also unbind theme_cls color updates when screen is left to avoid memory leaks
-        app = MDApp.get_running_app()
-        if app and hasattr(app, 'theme_cls'):
-             if hasattr(self, '_update_dropdown_menu_colors'):
-                  try:
-                      app.theme_cls.unbind(theme_style=self._update_dropdown_menu_colors)
-                      Logger.debug("SettingsScreen: Unbound dropdown menu color updates.")
-                  except ReferenceError:
-                       Logger.warning("SettingsScreen: Unbind failed, _update_dropdown_menu_colors no longer referenced.")
-
+        if self._theme_cls is not None and self._menu_colors_bound:
+             try:
+                 self._theme_cls.funbind('theme_style', self._menu_colors_trigger)
+                 self._menu_colors_bound = False
+                 Logger.debug("SettingsScreen: Unbound dropdown menu color updates.")
+             except ReferenceError:
+                  Logger.warning("SettingsScreen: Unbind failed, _update_dropdown_menu_colors no longer referenced.")
 
-    def _on_setting_changed(self, section: str, key: str, value: Any) -> None:
-        """Generic handler for setting changes that updates config."""
-        Logger.debug(f"SettingsScreen: Setting change '{section}.{key}' = '{value}'")
 
-        # Get expected type from current config value
-        current_value = self.config_manager.get_setting(section, key)
-        # Attempt to infer type from the *current* config value, default to string if not found
-        expected_type = type(current_value) if current_value is not None else str
+    def _on_setting_changed(self, section: str, key: str, value: Any, immediate: bool = False) -> None:
+        """
+        Generic handler for setting changes that updates config.
+        The converted value is committed after SETTING_COMMIT_DELAY so a burst of changes
+        to one setting ends in a single write; pass immediate=True to commit right away.
+        """
+        if self._loading:
+            # The value came from the config itself; there's nothing to commit or save
+            return
+        Logger.debug("SettingsScreen: Setting change '%s.%s' = '%s'", section, key, value)
 
+        setting_key = (section, key)
         try:
-            # Convert value to expected type
-            if expected_type is bool:
-                # MDSwitch provides boolean value directly
-                converted_value = bool(value)
-            elif expected_type is int:
-                 # Handle potential empty string from textfield before conversion
-                 if isinstance(value, str) and value.strip() == "":
-                      converted_value = 0 # Or handle as None/error depending on desired behavior
-                 else:
-                      converted_value = int(value)
-            elif expected_type is float:
-                 # Handle potential empty string from textfield before conversion
-                 if isinstance(value, str) and value.strip() == "":
-                      converted_value = 0.0 # Or handle as None/error
-                 else:
-                      converted_value = float(value)
-            else: # Default to string conversion for others, including dropdown values
-                 converted_value = str(value)
-
+            # Convert value to the setting's type, which is fixed per setting
+            expected_type = self._setting_types.get(setting_key)
+            if expected_type is None:
+                # Infer the type from the current config value once, default to string if not found
+                current_value = self.config_manager.get_setting(section, key)
+                expected_type = type(current_value) if current_value is not None else str
+                if current_value is not None:
+                    self._setting_types[setting_key] = expected_type
+            converted_value = _SETTING_CONVERTERS.get(expected_type, str)(value)
+        except (ValueError, TypeError) as e:
+            Logger.error(f"SettingsScreen: Failed to convert value '{value}' for '{section}.{key}': {e}")
+            # Revert UI to current config value
+            self._update_setting_widget(section, key, self.config_manager.get_setting(section, key))
+            return
 
+        self._pending_changes[setting_key] = converted_value
+        event = self._debounce_events.pop(setting_key, None)
+        if event:
+            event.cancel()
+        if immediate:
+            self._flush_setting(section, key)
+        else:
+            self._debounce_events[setting_key] = Clock.schedule_once(
+                partial(self._flush_setting, section, key), SETTING_COMMIT_DELAY)
+
+    def _flush_setting(self, section: str, key: str, *args) -> None:
+        """Commits the pending value of one setting to the config."""
+        setting_key = (section, key)
+        self._debounce_events.pop(setting_key, None)
+        if setting_key not in self._pending_changes:
+            return
+        converted_value = self._pending_changes.pop(setting_key)
+        try:
             # Update config
             self.config_manager.set_setting(section, key, converted_value)
 
             # Auto-save if enabled
             if self.config_manager.get_setting("general", "auto_save", False):
-                self.config_manager.save_config()
-                Logger.debug("SettingsScreen: Auto-saved config")
+                self._schedule_save()
 
-            # Special handling for theme-related settings
-            if section == "theme" and key == "current_theme":
-                self._apply_theme_settings(converted_value)
-            elif section == "theme" and key == "theme_style":
-                 # theme_style change also needs to re-apply theme settings to update colors
-                 current_theme = self.config_manager.get_setting("theme", "current_theme")
-                 self._apply_theme_settings(current_theme)
+            # Special handling for theme-related settings; theme_style also needs
+            # the theme re-applied to update colors
+            if section == "theme" and key in ("current_theme", "theme_style"):
+                self._theme_reapply_trigger()
 
-
-        except (ValueError, TypeError) as e:
-            Logger.error(f"SettingsScreen: Failed to convert value '{value}' for '{section}.{key}': {e}")
-            # Revert UI to current config value
-            self._update_setting_widget(section, key, current_value)
         except Exception as e:
-             Logger.error(f"SettingsScreen: Unexpected error handling setting change '{section}.{key}' = '{value}': {e}")
+             Logger.error(f"SettingsScreen: Unexpected error handling setting change '{section}.{key}' = '{converted_value}': {e}")
              # Revert UI on unexpected errors too
-             self._update_setting_widget(section, key, current_value)
+             self._update_setting_widget(section, key, self.config_manager.get_setting(section, key))
+
+    def _flush_pending_settings(self, *args) -> None:
+        """Commits every setting change still waiting for its debounce."""
+        for section, key in list(self._pending_changes):
+            event = self._debounce_events.pop((section, key), None)
+            if event:
+                event.cancel()
+            self._flush_setting(section, key)
+
+    def _discard_pending_settings(self) -> None:
+        """Drops uncommitted setting changes, e.g. before the config is reloaded or reset."""
+        for event in self._debounce_events.values():
+            event.cancel()
+        self._debounce_events.clear()
+        self._pending_changes.clear()
+        self._cancel_scheduled_save()
+        self._config_dirty = False
+
+    def _schedule_save(self) -> None:
+        """Marks the config dirty and schedules one auto-save for the current batch of changes."""
+        self._config_dirty = True
+        if self._save_event is None:
+            self._save_event = Clock.schedule_once(self._do_save, AUTO_SAVE_INTERVAL)
+
+    def _cancel_scheduled_save(self) -> None:
+        """Cancels a scheduled auto-save, leaving the dirty flag as it is."""
+        if self._save_event is not None:
+            self._save_event.cancel()
+            self._save_event = None
+
+    def _do_save(self, *args) -> None:
+        """Writes the config if it changed since the last save."""
+        self._save_event = None
+        if not self._config_dirty:
+            return
+        self._config_dirty = False
+        self.config_manager.save_config()
+        Logger.debug("SettingsScreen: Auto-saved config")
+
 
+    def _on_switch_active(self, instance: MDSwitch, value: bool) -> None:
+        """Handler for switch toggles; the switch carries its section/key."""
+        self._on_setting_changed(instance._section, instance._key, value)
+
+    def _on_textfield_validate(self, instance: MDTextField) -> None:
+        """Handler for Enter in a setting text field."""
+        self._on_setting_changed(instance._section, instance._key, instance.text)
+
+    def _on_textfield_focus(self, instance: MDTextField, focus: bool) -> None:
+        self._on_setting_textfield_focus(instance, focus, instance._section, instance._key)
+
+    def _on_dropdown_caller_release(self, instance: ThemeAwareDropdownCaller) -> None:
+        self._open_dropdown(instance._section, instance._key)
 
     def _on_setting_textfield_focus(self, instance: MDTextField,
                                      focus: bool, section: str, key: str) -> None:
         """Handler for text field focus changes to save on focus loss."""
         if not focus:
-            Logger.debug(f"SettingsScreen: TextField for '{section}.{key}' lost focus")
-            # Trigger change handler when focus is lost for text fields
-            self._on_setting_changed(section, key, instance.text)
+            Logger.debug("SettingsScreen: TextField for '%s.%s' lost focus", section, key)
+            # Trigger change handler when focus is lost for text fields, committing right away
+            self._on_setting_changed(section, key, instance.text, immediate=True)
 
     def _update_setting_widget(self, section: str, key: str, value: Any) -> None:
         """Updates a setting widget with the given value."""
@@ -764,63 +920,83 @@ class SettingsScreen(MDScreen):
                 return
 
 
+        # Widgets usually already show the value (e.g. on a reload), so only write changes
         if isinstance(widget, MDSwitch):
-            widget.active = bool(value)
-            Logger.debug(f"SettingsScreen: Updated Switch '{section}.{key}' to {value}")
+            new_value = bool(value)
+            if widget.active != new_value:
+                widget.active = new_value
+            Logger.debug("SettingsScreen: Updated Switch '%s.%s' to %s", section, key, value)
         elif isinstance(widget, MDTextField):
-            widget.text = str(value)
-            Logger.debug(f"SettingsScreen: Updated TextField '{section}.{key}' to '{value}'")
+            new_text = str(value)
+            if widget.text != new_text:
+                widget.text = new_text
+            Logger.debug("SettingsScreen: Updated TextField '%s.%s' to '%s'", section, key, value)
         elif isinstance(widget, ThemeAwareDropdownCaller):
              # For the new dropdown caller, update its 'text' property
-             widget.text = str(value)
-             Logger.debug(f"SettingsScreen: Updated DropdownCaller '{section}.{key}' text to '{value}'")
+             new_text = str(value)
+             if widget.text != new_text:
+                 widget.text = new_text
+             Logger.debug("SettingsScreen: Updated DropdownCaller '%s.%s' text to '%s'", section, key, value)
 
     def _load_settings_into_ui(self, *args) -> None:
         """Loads current settings from ConfigManager into UI widgets."""
         Logger.debug("SettingsScreen: Loading settings into UI")
+        # Leaving the screen unbinds the menu color updates; pick them up again on return
+        self._bind_menu_colors()
 
-        # Load values into all registered widgets (switches, text fields)
-        for (section, key), widget in self._setting_widgets.items():
-            value = self.config_manager.get_setting(section, key)
-            self._update_setting_widget(section, key, value)
-
-        # Load values into dropdown caller widgets
-        for (section, key), caller in self._dropdown_callers.items():
-            value = self.config_manager.get_setting(section, key)
-            # Update the 'text' property of the new dropdown caller
-            caller.text = str(value)
-            Logger.debug(f"SettingsScreen: Loaded dropdown caller '{section}.{key}' with text '{value}'")
+        # Read every setting in one go rather than one get_setting call per widget
+        settings = self.config_manager.snapshot()
 
+        self._loading = True
+        try:
+            # Load values into all registered widgets (switches, text fields)
+            for (section, key), widget in self._setting_widgets.items():
+                value = settings.get((section, key))
+                self._update_setting_widget(section, key, value)
+
+            # Load values into dropdown caller widgets
+            for (section, key), caller in self._dropdown_callers.items():
+                value = settings.get((section, key))
+                # Update the 'text' property of the new dropdown caller
+                new_text = str(value)
+                if caller.text != new_text:
+                    caller.text = new_text
+                Logger.debug("SettingsScreen: Loaded dropdown caller '%s.%s' with text '%s'", section, key, value)
+        finally:
+            self._loading = False
 
         # Reinitialize dropdowns to ensure they're up-to-date with available themes/fonts
         self._initialize_dropdowns()
 
         # Apply current theme settings from config to KivyMD app when entering the screen
-        current_theme = self.config_manager.get_setting("theme", "current_theme", "default")
-        self._apply_theme_settings(current_theme)
+        self._theme_reapply_trigger()
 
 
-    def _save_settings(self) -> None:
+    def _save_settings(self, *args) -> None:
         """Explicitly saves the current settings from the UI to the config file."""
         Logger.debug("SettingsScreen: Explicit save triggered")
 
         # Force save any focused text fields by triggering focus loss
-        # Iterate over _setting_widgets to find MDTextFields
-        for (section, key), widget in self._setting_widgets.items():
-            if isinstance(widget, MDTextField) and widget.focus:
-                 Logger.debug(f"SettingsScreen: Forcing save on focused TextField '{section}.{key}'")
+        for section, key, widget in self._text_field_widgets:
+            if widget.focus:
+                 Logger.debug("SettingsScreen: Forcing save on focused TextField '%s.%s'", section, key)
                  # Call the focus loss handler directly, setting focus to False
                  self._on_setting_textfield_focus(widget, False, section, key)
 
+        # Commit switch and other changes still waiting for their debounce
+        self._flush_pending_settings()
+
         # Note: ThemeAwareDropdownCallers don't use focus or have text_validate,
         # their value is saved immediately when an item is selected via _select_dropdown_item,
         # or when _on_setting_changed is triggered by the MDSwitch or MDTextField.
 
-        # Final save of the config file
-        self.config_manager.save_config()
+        # Final save of the config file, replacing any scheduled auto-save
+        self._cancel_scheduled_save()
+        self._config_dirty = True
+        self._do_save()
         Logger.info("SettingsScreen: Config saved explicitly")
 
-    def _show_reset_confirmation(self) -> None:
+    def _show_reset_confirmation(self, *args) -> None:
         """Shows a confirmation dialog before resetting settings."""
         Logger.debug("SettingsScreen: Showing reset confirmation dialog.")
         # Instantiate ConfirmDialog (it handles its own theme colors based on app theme)
@@ -828,6 +1004,7 @@ class SettingsScreen(MDScreen):
         if hasattr(self, '_confirm_dialog') and self._confirm_dialog:
              self._confirm_dialog.dismiss()
 
+        from .dialogs import ConfirmDialog
         self._confirm_dialog = ConfirmDialog(
             title="Reset Settings?",
             text="Are you sure you want to reset all settings to their default values?\n\nThis action cannot be undone."
@@ -839,38 +1016,38 @@ class SettingsScreen(MDScreen):
         """Resets settings to default via ConfigManager and updates the UI."""
         Logger.info("SettingsScreen: Resetting settings to defaults.")
         if self.config_manager:
+             self._discard_pending_settings()
              # Call the new reset method on the ConfigManager
-             reset_config_data = self.config_manager.reset_to_defaults()
+             self.config_manager.reset_to_defaults()
              Logger.info("SettingsScreen: Settings reset by ConfigManager.")
              # Reload the UI with the new default settings
              self._load_settings_into_ui()
              Logger.info("SettingsScreen: UI updated after reset.")
              # TODO: Potentially show a small notification to the user (e.g., toast)
 
-             # Apply theme settings after reset, as current_theme might have changed
-             current_theme = reset_config_data.get("theme", {}).get("current_theme", "default")
-             self._apply_theme_settings(current_theme)
+             # _load_settings_into_ui already requested the theme re-apply for the reset
+             # config, as current_theme might have changed
 
         else:
              Logger.error("SettingsScreen: ConfigManager is not available. Cannot reset settings.")
 
 
-    def _reload_settings(self) -> None:
+    def _reload_settings(self, *args) -> None:
         """Reloads settings from the config file and updates the UI."""
         Logger.debug("SettingsScreen: Reloading settings")
         self._dismiss_dropdowns()
+        self._discard_pending_settings()
         self.config_manager.reload_config()
         self._load_settings_into_ui()
 
-    def _close_settings(self) -> None:
+    def _close_settings(self, *args) -> None:
         """Dismisses the settings screen by navigating back."""
         Logger.debug("SettingsScreen: Closing settings screen")
         # Explicitly save settings before closing if auto_save is false or to be safe
         self._save_settings() # Ensure settings are saved
 
         if self.manager:
-            from kivy.uix.screenmanager import SwapTransition
-            self.manager.transition = SwapTransition()
+            self.manager.transition = _CLOSE_TRANSITION
             self.manager.current = 'main'
             Logger.info("SettingsScreen: Navigated back to 'main'.")
         else:
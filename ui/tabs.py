@@ -7,15 +7,15 @@ from kivy.properties import (
     BooleanProperty,
     StringProperty,
     ColorProperty,
-    ObjectProperty,
-    DictProperty
+    ObjectProperty
 )
 from kivy.metrics import dp, sp
+from kivy.clock import Clock
 from kivy.graphics import Color, Rectangle
 from kivy.logger import Logger
 import os
-from weakref import ref
-from typing import Optional, Any, Callable
+from functools import partial
+from typing import Optional, Any, Callable, Dict
 
 class TabHeader(BoxLayout):
     """
@@ -34,7 +34,7 @@ class TabHeader(BoxLayout):
     on_close = ObjectProperty(None, allownone=True)
     on_select = ObjectProperty(None, allownone=True)
 
-    def __init__(self, tab_id: int, parent: Optional[Any] = None, file_path: Optional[str] = None, modified: bool = False, **kwargs):
+    def __init__(self, tab_id: int, file_path: Optional[str] = None, modified: bool = False, **kwargs):
         super().__init__(**kwargs)
         self.orientation = 'horizontal'
         self.spacing = dp(0)
@@ -45,7 +45,8 @@ class TabHeader(BoxLayout):
         self.tab_id = tab_id
         self.file_path = file_path
         self.modified = modified
-        self._parent_ref = ref(parent) if parent else None
+        # File name part of the label, recomputed only when file_path changes
+        self._cached_basename = self._get_basename()
 
         self._tab_label = Label(
             text=self._get_display_text(),
@@ -65,32 +66,37 @@ class TabHeader(BoxLayout):
         self.bind(
             pos=self._update_canvas,
             size=self._update_canvas,
-            file_path=self._update_display_text,
+            file_path=self._on_file_path_change,
             modified=self._update_display_text,
             is_active=self._update_visual_state
         )
 
+    # The update handlers are bound at the end of __init__, once the label and
+    # canvas instructions exist, and unbound in cleanup() before they are dropped
     def _update_canvas(self, instance, value):
-        if hasattr(self, 'bg_rect'):
-            self.bg_rect.pos = instance.pos
-            self.bg_rect.size = instance.size
+        self.bg_rect.pos = instance.pos
+        self.bg_rect.size = instance.size
+
+    def _get_basename(self) -> str:
+        return os.path.basename(str(self.file_path)) if self.file_path else f"Untitled {self.tab_id}"
 
     def _get_display_text(self) -> str:
-        name = os.path.basename(str(self.file_path)) if self.file_path else f"Untitled {self.tab_id}"
-        return f"{name}{' *' if self.modified else ''}"
+        return self._cached_basename + (' *' if self.modified else '')
+
+    def _on_file_path_change(self, instance, value):
+        self._cached_basename = self._get_basename()
+        self._update_display_text(instance, value)
 
     def _update_display_text(self, instance, value):
-        if hasattr(self, '_tab_label'):
-            self._tab_label.text = self._get_display_text()
+        self._tab_label.text = self._get_display_text()
 
     def _update_visual_state(self, instance, value):
-        if hasattr(self, 'bg_color_instruction') and hasattr(self, '_tab_label'):
-            if self.is_active:
-                self.bg_color_instruction.rgba = self.active_bg
-                self._tab_label.color = self.active_text
-            else:
-                self.bg_color_instruction.rgba = self.inactive_bg
-                self._tab_label.color = self.inactive_text
+        if self.is_active:
+            self.bg_color_instruction.rgba = self.active_bg
+            self._tab_label.color = self.active_text
+        else:
+            self.bg_color_instruction.rgba = self.inactive_bg
+            self._tab_label.color = self.inactive_text
 
     def on_touch_down(self, touch):
         if self.collide_point(*touch.pos):
@@ -108,33 +114,64 @@ class TabHeader(BoxLayout):
 
     def cleanup(self):
         """Clean up resources when tab is removed"""
-        if hasattr(self, '_tab_label'):
-            if self._tab_label.parent:
-                self._tab_label.parent.remove_widget(self._tab_label)
-            self._tab_label = None
-
-        if hasattr(self, 'bg_color_instruction') and self.canvas.before:
-            self.canvas.before.remove(self.bg_color_instruction)
-        if hasattr(self, 'bg_rect') and self.canvas.before:
-            self.canvas.before.remove(self.bg_rect)
+        if self._tab_label is None:
+            return
 
+        # Unbind first so the update handlers never see the released resources
         self.unbind(
             pos=self._update_canvas,
             size=self._update_canvas,
-            file_path=self._update_display_text,
+            file_path=self._on_file_path_change,
             modified=self._update_display_text,
             is_active=self._update_visual_state
         )
 
+        if self._tab_label.parent:
+            self._tab_label.parent.remove_widget(self._tab_label)
+        self._tab_label = None
+
+        if self.canvas.before:
+            self.canvas.before.remove(self.bg_color_instruction)
+            self.canvas.before.remove(self.bg_rect)
+
+class TabEntry:
+    """
+    Header, content and file state of one tab in TabManager.tabs.
+    content stays None until the tab is first shown, when factory builds it.
+    """
+    __slots__ = ('header', 'content', 'factory', 'file_path', 'modified')
+
+    def __init__(self, header: TabHeader, content: Any, file_path: Optional[str] = None, modified: bool = False,
+                 factory: Optional[Callable[[], Any]] = None):
+        self.header = header
+        self.content = content
+        self.factory = factory
+        self.file_path = file_path
+        self.modified = modified
+
+    def get_content(self) -> Any:
+        """Returns the content widget, building it on first use."""
+        if self.content is None:
+            self.content = self.factory()
+            self.factory = None
+        return self.content
+
+PREFETCH_DELAY = 0.5 # Seconds after a switch before one unbuilt tab is prefetched
+
 class TabManager(BoxLayout):
     current_tab_id = NumericProperty(-1)
-    tabs = DictProperty({})
+    # Build one unbuilt tab's content shortly after each switch; turn off on low-memory devices
+    enable_prefetch = BooleanProperty(True)
 
     def __init__(self, **kwargs):
+        self.register_event_type('on_tabs_changed')
         super().__init__(**kwargs)
         self.orientation = 'vertical'
         self.spacing = dp(2)
         self.next_tab_id = 1
+        # A plain dict; observers bind on_tabs_changed, dispatched once per add/remove
+        self.tabs: Dict[int, TabEntry] = {}
+        self._prefetch_trigger = Clock.create_trigger(self._prefetch_next, PREFETCH_DELAY)
         
         # Header Scroll View
         self.headers_scroll = ScrollView(
@@ -160,56 +197,81 @@ class TabManager(BoxLayout):
         self.content_area = BoxLayout(size_hint=(1, 1))
         self.add_widget(self.content_area)
 
-    def add_tab(self, file_path=None, content=None):
+    def add_tab(self, file_path=None, content=None, content_factory=None, activate=True):
+        """
+        Adds a tab and returns its id. Pass content_factory instead of content to build
+        the content widget only when the tab is first shown; with activate=False the new
+        tab is not switched to, so restoring many tabs builds none of their content.
+        """
         tab_id = self.next_tab_id
         self.next_tab_id += 1
         
         header = TabHeader(
             tab_id=tab_id,
-            parent=self.headers_container,
             file_path=file_path
         )
-        header.on_select = lambda tab_id=tab_id: self.switch_tab(tab_id)
+        # The header calls on_select with its own tab_id, so the bound method is enough
+        header.on_select = self.switch_tab
         
-        content = content if content else Label(text=f"Tab {tab_id} Content")
+        if not content and content_factory is None:
+            content_factory = partial(self._placeholder_content, tab_id)
         
-        self.tabs[tab_id] = {
-            'header': header,
-            'content': content,
-            'file_path': file_path,
-            'modified': False
-        }
+        self.tabs[tab_id] = TabEntry(header, content or None, file_path, False, content_factory)
         
         self.headers_container.add_widget(header)
-        self.switch_tab(tab_id)
+        if activate or self.current_tab_id not in self.tabs:
+            self.switch_tab(tab_id)
+        self.dispatch('on_tabs_changed')
         return tab_id
 
+    @staticmethod
+    def _placeholder_content(tab_id):
+        return Label(text=f"Tab {tab_id} Content")
+
     def remove_tab(self, tab_id):
-        if tab_id in self.tabs:
-            self.headers_container.remove_widget(self.tabs[tab_id]['header'])
-            if self.tabs[tab_id]['content'].parent:
-                self.content_area.remove_widget(self.tabs[tab_id]['content'])
+        entry = self.tabs.get(tab_id)
+        if entry is not None:
+            self.headers_container.remove_widget(entry.header)
+            if entry.content is not None and entry.content.parent:
+                self.content_area.remove_widget(entry.content)
             
-            self.tabs[tab_id]['header'].cleanup()
+            entry.header.cleanup()
             del self.tabs[tab_id]
             
             if self.tabs:
                 self.switch_tab(next(iter(self.tabs.keys())))
             else:
                 self.current_tab_id = -1
+            self.dispatch('on_tabs_changed')
+
+    def on_tabs_changed(self, *args):
+        pass
 
     def switch_tab(self, tab_id):
         if self.current_tab_id == tab_id:
             return
         
-        if self.current_tab_id in self.tabs:
-            self.content_area.remove_widget(self.tabs[self.current_tab_id]['content'])
-            self.tabs[self.current_tab_id]['header'].is_active = False
+        previous = self.tabs.get(self.current_tab_id)
+        if previous is not None:
+            self.content_area.remove_widget(previous.content)
+            previous.header.is_active = False
         
-        self.content_area.add_widget(self.tabs[tab_id]['content'])
-        self.tabs[tab_id]['header'].is_active = True
+        entry = self.tabs[tab_id]
+        self.content_area.add_widget(entry.get_content())
+        entry.header.is_active = True
         self.current_tab_id = tab_id
 
         # Scroll to make the tab header visible
-        header = self.tabs[tab_id]['header']
-        self.headers_scroll.scroll_to(header)
\ No newline at end of file
+        self.headers_scroll.scroll_to(entry.header)
+
+        if self.enable_prefetch:
+            self._prefetch_trigger()
+
+    def _prefetch_next(self, *args):
+        """Builds the content of the first tab that hasn't been shown yet, without showing it."""
+        if not self.enable_prefetch:
+            return
+        for entry in self.tabs.values():
+            if entry.content is None:
+                entry.get_content()
+                return
\ No newline at end of file
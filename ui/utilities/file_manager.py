@@ -1,5 +1,7 @@
 import os
-from threading import Thread
+import re
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor
 from kivy.app import App
 from kivy.clock import Clock
 from kivy.uix.filechooser import FileChooserListView
@@ -15,63 +17,148 @@ from ..dialogs import ErrorDialog
 
 DOCUMENTS_PATH = "/storage/emulated/0/Documents"
 INCLUDE_FILTER = ["*.txt", "*.json", "*.csv", "*.md"]
+# All include globs as one precompiled regex, so a listing does one match per entry
+_INCLUDE_RE = re.compile('|'.join(fnmatch.translate(pattern) for pattern in INCLUDE_FILTER))
+IO_BUFFER_SIZE = 128 * 1024
+WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+IO_WORKERS = 2 # Reads and writes beyond this many queue up instead of spawning more threads
+ENCODE_CHUNK_CHARS = 32 * 1024 # Text longer than this is encoded and written piecewise
+
+def _include_filter(folder, filename):
+    return _INCLUDE_RE.match(filename) is not None
+
+def _read_all(file_path):
+    # Size the read from fstat so a typical file comes back from a single os.read
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size) if size else b''
+        if len(data) < size or not size:
+            # Short read, or a file whose size fstat doesn't report; read until EOF
+            chunks = [data]
+            while True:
+                chunk = os.read(fd, IO_BUFFER_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            data = b''.join(chunks)
+        return data
+    finally:
+        os.close(fd)
+
+def _write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
 
 class ThemeAwarePopup(ThemableBehavior, Popup):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        # Buttons to recolor, collected from the content once, and the color they last got
+        self._themed_buttons = None
+        self._last_primary = None
         Clock.schedule_once(self._bind_theme, 0)
 
     def _bind_theme(self, dt):
         self.theme_cls.bind(theme_style=self._on_theme_change)
         self._apply_theme()
 
+    def on_content(self, instance, content):
+        super().on_content(instance, content)
+        self._themed_buttons = None
+        self._last_primary = None
+
     def _on_theme_change(self, *args):
         self._apply_theme()
 
     def _apply_theme(self):
-        if self.content:
-            for widget in self.content.walk():
-                if isinstance(widget, MDRaisedButton):
-                    widget.md_bg_color = self.theme_cls.primary_color
+        if not self.content:
+            return
+        primary_color = tuple(self.theme_cls.primary_color)
+        if primary_color == self._last_primary:
+            return
+        if self._themed_buttons is None:
+            self._themed_buttons = [widget for widget in self.content.walk() if isinstance(widget, MDRaisedButton)]
+        for button in self._themed_buttons:
+            button.md_bg_color = primary_color
+        self._last_primary = primary_color
 
 class FileManager(ThemableBehavior):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._running_app = App.get_running_app()
+        self._io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix='fm-io')
+        # File dialogs, built on first use and reused; the chooser lists its directory only when it changes
+        self._saver_popup = None
+        self._saver_chooser = None
+        self._saver_filename_input = None
+        self._saver_request = None
+        self._loader_popup = None
+        self._loader_chooser = None
+        self._loader_request = None
+        self._chooser_mtimes = {}
 
-    def write_file(self, content, file_path=None, callback=None, prompt=True):
+    def write_file(self, content, file_path=None, callback=None, prompt=True, durable=False, on_start=None):
+        # on_start runs on the main thread once the write is actually queued, not while a dialog is open
         if prompt and file_path is None:
-            self._show_file_saver(content, callback)
+            self._show_file_saver(content, callback, durable, on_start)
         else:
-            Thread(target=self._write_threaded, args=(content, file_path, callback), daemon=True).start()
+            if on_start:
+                on_start()
+            self._io_pool.submit(self._write_threaded, content, file_path, callback, durable)
 
-    def read_file(self, file_path=None, callback=None, prompt=True):
+    def read_file(self, file_path=None, callback=None, prompt=True, on_start=None):
         if prompt and file_path is None:
-            self._show_file_loader(callback)
+            self._show_file_loader(callback, on_start)
         else:
-            Thread(target=self._read_threaded, args=(file_path, callback), daemon=True).start()
+            if on_start:
+                on_start()
+            self._io_pool.submit(self._read_threaded, file_path, callback)
 
-    def _write_threaded(self, content, file_path, callback):
+    def shutdown(self, wait=True):
+        """Stops the I/O workers, by default after the queued reads and writes finish."""
+        self._io_pool.shutdown(wait=wait)
+
+    def _write_threaded(self, content, file_path, callback, durable=False):
         try:
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Write straight to the descriptor, skipping the buffered file object
+            fd = os.open(file_path, WRITE_FLAGS, 0o644)
+            try:
+                if isinstance(content, bytes) or len(content) <= ENCODE_CHUNK_CHARS:
+                    _write_all(fd, content if isinstance(content, bytes) else content.encode('utf-8'))
+                else:
+                    # Large documents are encoded a chunk at a time so no full-size copy is allocated
+                    for start in range(0, len(content), ENCODE_CHUNK_CHARS):
+                        _write_all(fd, content[start:start + ENCODE_CHUNK_CHARS].encode('utf-8'))
+                if durable:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
             self._run_callback(callback, True, file_path)
         except Exception as e:
             self._show_error("Save Error", str(e), callback)
 
     def _read_threaded(self, file_path, callback):
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = _read_all(file_path).decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
             self._run_callback(callback, True, content)
         except Exception as e:
             self._show_error("Load Error", str(e), callback)
 
-    def _show_file_saver(self, content, callback):
+    def _show_file_saver(self, content, callback, durable=False, on_start=None):
+        # The popup is built once and reused; the pending save is kept on the manager
+        self._saver_request = (content, callback, durable, on_start)
+        if self._saver_popup is None:
+            self._build_file_saver()
+        else:
+            self._refresh_chooser(self._saver_chooser)
+        self._saver_popup.open()
+
+    def _build_file_saver(self):
         box = BoxLayout(orientation='vertical', spacing=dp(15), padding=dp(20))
 
-        chooser = FileChooserListView(path=DOCUMENTS_PATH, filters=INCLUDE_FILTER)
+        chooser = FileChooserListView(path=DOCUMENTS_PATH, filters=[_include_filter])
 
         filename_box = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(50), spacing=dp(10))
         filename_box.add_widget(Label(text="Filename:", size_hint_x=None, width=dp(80)))
@@ -89,48 +176,77 @@ class FileManager(ThemableBehavior):
         popup = ThemeAwarePopup(title='Save File', content=None, size_hint=(0.95, 0.95))
 
         btn_box.add_widget(MDRaisedButton(text='CANCEL', on_release=lambda x: popup.dismiss()))
-        btn_box.add_widget(MDRaisedButton(
-            text='SAVE',
-            on_release=lambda x: self._save_file(chooser, filename_input, content, callback, popup),
-        ))
+        btn_box.add_widget(MDRaisedButton(text='SAVE', on_release=lambda x: self._save_file()))
 
         box.add_widget(chooser)
         box.add_widget(filename_box)
         box.add_widget(btn_box)
         popup.content = box
-        popup.open()
+        self._saver_popup = popup
+        self._saver_chooser = chooser
+        self._saver_filename_input = filename_input
+        self._chooser_mtimes[chooser] = self._dir_mtime(chooser.path)
 
-    def _save_file(self, chooser, filename_input, content, callback, popup):
-        filename = filename_input.text.strip()
+    def _save_file(self):
+        filename = self._saver_filename_input.text.strip()
         if not filename:
             ErrorDialog(title="Error", text="Filename cannot be empty").open()
             return
 
-        file_path = os.path.join(chooser.path, filename)
-        popup.dismiss()
-        self.write_file(content, file_path, callback, prompt=False)
+        content, callback, durable, on_start = self._saver_request
+        self._saver_request = None
+        file_path = os.path.join(self._saver_chooser.path, filename)
+        self._saver_popup.dismiss()
+        self.write_file(content, file_path, callback, prompt=False, durable=durable, on_start=on_start)
+
+    def _show_file_loader(self, callback, on_start=None):
+        self._loader_request = (callback, on_start)
+        if self._loader_popup is None:
+            self._build_file_loader()
+        else:
+            self._refresh_chooser(self._loader_chooser)
+        self._loader_popup.open()
 
-    def _show_file_loader(self, callback):
+    def _build_file_loader(self):
         box = BoxLayout(orientation='vertical', spacing=dp(15), padding=dp(20))
 
-        chooser = FileChooserListView(path=DOCUMENTS_PATH, filters=INCLUDE_FILTER)
+        chooser = FileChooserListView(path=DOCUMENTS_PATH, filters=[_include_filter])
 
         btn_box = BoxLayout(size_hint_y=None, height=dp(60), spacing=dp(15))
         popup = ThemeAwarePopup(title='Load File', content=None, size_hint=(0.95, 0.95))
 
         btn_box.add_widget(MDRaisedButton(text='CANCEL', on_release=lambda x: popup.dismiss()))
-        btn_box.add_widget(MDRaisedButton(text='LOAD', on_release=lambda x: self._load_file(chooser, callback, popup)))
+        btn_box.add_widget(MDRaisedButton(text='LOAD', on_release=lambda x: self._load_file()))
 
         box.add_widget(chooser)
         box.add_widget(btn_box)
         popup.content = box
-        popup.open()
+        self._loader_popup = popup
+        self._loader_chooser = chooser
+        self._chooser_mtimes[chooser] = self._dir_mtime(chooser.path)
 
-    def _load_file(self, chooser, callback, popup):
+    def _load_file(self):
+        chooser = self._loader_chooser
         if chooser.selection:
             file_path = chooser.selection[0]
-            popup.dismiss()
-            self.read_file(file_path, callback, prompt=False)
+            callback, on_start = self._loader_request
+            self._loader_request = None
+            self._loader_popup.dismiss()
+            self.read_file(file_path, callback, prompt=False, on_start=on_start)
+
+    @staticmethod
+    def _dir_mtime(path):
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def _refresh_chooser(self, chooser):
+        """Re-lists a reused chooser's directory, but only if it changed since the last listing."""
+        mtime = self._dir_mtime(chooser.path)
+        if mtime is None or mtime != self._chooser_mtimes.get(chooser):
+            chooser._update_files()
+            self._chooser_mtimes[chooser] = mtime
 
     def _show_error(self, title, message, callback):
         Clock.schedule_once(lambda dt: (
@@ -142,9 +258,9 @@ class FileManager(ThemableBehavior):
         if callback:
             Clock.schedule_once(lambda dt: callback(*args))
 
-    def write_file_mainthread(self, content, file_path):
+    def write_file_mainthread(self, content, file_path, durable=False):
         result = [None]
-        self._write_threaded(content, file_path, lambda s, p: result.__setitem__(0, s))
+        self._write_threaded(content, file_path, lambda s, p: result.__setitem__(0, s), durable)
         return result[0]
 
     def read_file_mainthread(self, file_path):
@@ -1,16 +1,62 @@
 # history_manager.py
 # This file contains the HistoryManager class for managing undo/redo states.
 
-import hashlib # Used for generating hashes to compare states efficiently
-from collections import deque # Use deque for efficient appending and popping from ends
+from time import monotonic # Debounce deadlines
 from kivy.clock import Clock # Import Clock for scheduling debounce
 from kivy.properties import ObjectProperty # Keep for clarity if needed elsewhere, though not strictly used for binding here
 from kivy.logger import Logger # For logging history actions
 
+KEYFRAME_INTERVAL = 20 # Store a full snapshot after this many deltas so reconstruction stays short
+
+
+def _common_prefix_len(a, b, limit):
+    """
+    Length of the common prefix of a and b, capped at limit.
+    Bisects with slice comparisons so the character compares run in C.
+    """
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[low:mid] == b[low:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _common_suffix_len(a, b, limit):
+    """Length of the common suffix of a and b, capped at limit."""
+    len_a, len_b = len(a), len(b)
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[len_a - mid:len_a - low] == b[len_b - mid:len_b - low]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _make_delta(old, new):
+    """
+    Builds a minimal (offset, deleted_len, inserted_text) edit turning old into new
+    by trimming the common prefix and suffix.
+    """
+    limit = min(len(old), len(new))
+    start = _common_prefix_len(old, new, limit)
+    end = _common_suffix_len(old, new, limit - start)
+    return (start, len(old) - start - end, new[start:len(new) - end])
+
+
+def _apply_delta(text, delta):
+    """Applies an (offset, deleted_len, inserted_text) edit to text."""
+    offset, deleted_len, inserted = delta
+    return text[:offset] + inserted + text[offset + deleted_len:]
+
 class HistoryManager:
     """
     Manages the history of text states for undo/redo functionality.
-    Uses a deque for efficient state storage and a debounce mechanism
+    Uses a capped list for state storage and a debounce mechanism
     to prevent excessive state commits on every key press.
     """
     # No Kivy properties needed since it's not a Kivy EventDispatcher
@@ -25,63 +71,98 @@ class HistoryManager:
             app_clock (kivy.clock.Clock): The Kivy Clock instance for scheduling.
         """
         self.max_states = max_states
-        # Use deque with maxlen for efficient limited history storage
-        self.states = deque(maxlen=max_states)
-        self.current_index = -1 # Index of the current state in the deque
+        # A plain list capped at max_states: states are only appended and truncated from the right,
+        # and indexing it is O(1) wherever current_index points.
+        # Entries are either full text keyframes (str) or deltas against the previous entry (tuple).
+        self.states = []
+        self._current_text = None # Reconstructed text of the state at current_index
+        self.current_index = -1 # Index of the current state in states
         self._debounce_event = None # Reference to the scheduled debounce event
+        self._deadline = 0.0 # monotonic() time at which the pending text is committed
         self.debounce_time = 0.5  # Time in seconds to wait before committing state after last change
         self.pending_text = None # Stores the text that's waiting to be committed
+        self.on_change = None # Optional callback fired whenever the history or pending state changes
 
         # Store the injected Kivy Clock instance
         self.app_clock = app_clock
         if not self.app_clock:
              Logger.warning("HistoryManager: No Kivy Clock instance provided! Debouncing will not work.")
 
-    def _get_hash(self, text):
-        """Generates SHA256 hash of the text for efficient state comparison."""
-        if not isinstance(text, str):
-            Logger.warning(f"HistoryManager: Attempted to hash non-string type: {type(text)}")
-            return hashlib.sha256(b'').hexdigest() # Return hash of empty string for safety
-        return hashlib.sha256(text.encode('utf-8')).hexdigest()
-
     def add_state(self, text):
         """
         Adds a new text state to the history if it's different from the last state.
         If not at the end of history (due to undo), truncates future history.
         """
-        text_hash = self._get_hash(text)
         # Check if the current state is identical to the last committed state
-        if self.current_index >= 0 and text_hash == self._get_hash(self.states[self.current_index]):
+        if self.current_index >= 0 and text == self._current_text:
             # Logger.info("HistoryManager: Text state is identical to current, not adding to history.") # Keep logging minimal
             return # Don't add duplicate states
 
         # If we're not at the end of the history (i.e., we've undone some steps),
         # adding a new state should truncate the "future" history.
         if self.current_index < len(self.states) - 1:
-            # Ensure we are working with a list to truncate effectively, then convert back to deque
-            self.states = deque(list(self.states)[:self.current_index + 1], maxlen=self.max_states)
-            Logger.info(f"HistoryManager: Truncating history. New length: {len(self.states)}")
+            # Drop the undone states off the right end in place with one slice delete
+            del self.states[self.current_index + 1:]
+            Logger.info("HistoryManager: Truncating history. New length: %s", len(self.states))
 
-        # Add the new state to the end of the deque
-        self.states.append(text)
+        # The oldest entry must stay a keyframe, so promote the next one before it is dropped below
+        if len(self.states) == self.max_states and len(self.states) > 1 and not isinstance(self.states[1], str):
+            self.states[1] = self._reconstruct(1)
+
+        # Add the new state to the end of the list, as a delta unless a keyframe is due
+        if self._current_text is None or self.max_states == 1 or self._deltas_since_keyframe() >= KEYFRAME_INTERVAL - 1:
+            self.states.append(text)
+        else:
+            self.states.append(_make_delta(self._current_text, text))
+        if len(self.states) > self.max_states:
+            # Over the cap: drop the oldest state
+            del self.states[0]
+        self._current_text = text
         # Update the current index to point to the newly added state
         self.current_index = len(self.states) - 1
+        self._notify_change()
         # Logger.info(f"HistoryManager: State added. History size: {len(self.states)}, Index: {self.current_index}") # Keep logging minimal
 
+    def _notify_change(self):
+        """Invokes the on_change callback, if one is set."""
+        if self.on_change:
+            self.on_change()
+
+    def _deltas_since_keyframe(self):
+        """Counts the delta entries after the most recent keyframe."""
+        count = 0
+        for index in range(len(self.states) - 1, -1, -1):
+            if isinstance(self.states[index], str):
+                break
+            count += 1
+        return count
+
+    def _reconstruct(self, index):
+        """Rebuilds the full text at index by replaying deltas from the nearest keyframe before it."""
+        start = index
+        while not isinstance(self.states[start], str):
+            start -= 1
+        text = self.states[start]
+        for position in range(start + 1, index + 1):
+            text = _apply_delta(text, self.states[position])
+        return text
+
     def commit_state_debounced(self, text):
         """
         Commits the state after a debounce period to avoid saving state on every key press.
-        Cancels any pending commit and schedules a new one.
+        Each call pushes the commit deadline back; the scheduled tick is left alone and
+        reschedules itself until the deadline has passed, instead of a cancel and
+        reschedule per key press.
         """
-        # If there's a pending debounce event, cancel it
-        if self._debounce_event:
-            self._debounce_event.cancel()
-            self._debounce_event = None # Clear the event so a new one can be scheduled
-
+        was_idle = self.pending_text is None
         self.pending_text = text # Store the text to be committed
         if self.app_clock:
-            # Schedule _perform_commit to be called after debounce_time
-            self._debounce_event = self.app_clock.schedule_once(self._perform_commit, self.debounce_time)
+            self._deadline = monotonic() + self.debounce_time
+            if was_idle:
+                self._notify_change()
+            if self._debounce_event is None:
+                # Tick once the debounce period is over
+                self._debounce_event = self.app_clock.schedule_once(self._debounce_tick, self.debounce_time)
             # Logger.info(f"HistoryManager: Scheduled commit for text: {text[:20]}... Debounce event: {self._debounce_event}") # Keep logging minimal
         else:
             Logger.warning("HistoryManager: No Kivy Clock instance provided. Debounced commit cannot be scheduled.")
@@ -89,6 +170,14 @@ class HistoryManager:
             self.add_state(self.pending_text)
             self.pending_text = None
 
+    def _debounce_tick(self, dt):
+        """Commits if the deadline has passed, otherwise waits out the rest of it."""
+        remaining = self._deadline - monotonic()
+        if remaining > 0:
+            self._debounce_event = self.app_clock.schedule_once(self._debounce_tick, remaining)
+            return
+        self._perform_commit(dt)
+
     def _perform_commit(self, dt):
         """
         Internal method to perform the actual state commit.
@@ -98,8 +187,28 @@ class HistoryManager:
             self.add_state(self.pending_text)
             # Logger.info(f"HistoryManager: Performed debounced commit for text: {self.pending_text[:20]}... History size: {len(self.states)}, Index: {self.current_index}") # Keep logging minimal
             self.pending_text = None # Clear pending text after commit
+            self._notify_change() # add_state may skip duplicates, so report the cleared pending text too
         self._debounce_event = None # Clear the event reference after it's executed
 
+    def flush_pending(self):
+        """
+        Commits any text still waiting for its debounce period right away.
+        Used before undo/redo so the most recent edit stays in the history.
+        """
+        if self._debounce_event:
+            self._debounce_event.cancel()
+        self._perform_commit(0)
+
+    def cancel_pending(self):
+        """
+        Drops any commit that is still waiting for its debounce period.
+        Used before restoring a state so a stale commit cannot overwrite it.
+        """
+        if self._debounce_event:
+            self._debounce_event.cancel()
+            self._debounce_event = None
+        self.pending_text = None
+
     def undo(self):
         """
         Move backward in the history stack and return the text state.
@@ -108,7 +217,9 @@ class HistoryManager:
         if self.current_index > 0:
             self.current_index -= 1
             Logger.info(f"HistoryManager: Undoing. New index: {self.current_index}")
-            return self.states[self.current_index]
+            self._current_text = self._reconstruct(self.current_index)
+            self._notify_change()
+            return self._current_text
         Logger.info("HistoryManager: No more undo history.")
         return None
 
@@ -120,7 +231,11 @@ class HistoryManager:
         if self.current_index < len(self.states) - 1:
             self.current_index += 1
             Logger.info(f"HistoryManager: Redoing. New index: {self.current_index}")
-            return self.states[self.current_index]
+            entry = self.states[self.current_index]
+            # Deltas are relative to the previous entry, which is the state we are leaving
+            self._current_text = entry if isinstance(entry, str) else _apply_delta(self._current_text, entry)
+            self._notify_change()
+            return self._current_text
         Logger.info("HistoryManager: No more redo history.")
         return None
 
@@ -129,16 +244,13 @@ class HistoryManager:
         Generates a visual pointer string representing the current position in states.
         Uses '~' for states and '°' for the current state.
         """
-        if not self.states:
+        count = len(self.states)
+        if not count:
             return ""
 
-        pointer = []
-        for i in range(len(self.states)):
-            if i == self.current_index:
-                pointer.append("°") # Degree sign for pointer
-            else:
-                pointer.append("~") # Tilde for states
-        return " ".join(pointer)
+        # "~ ~ ° ~": one "~" per state before and after the current one, joined by spaces
+        index = self.current_index
+        return "~ " * index + "°" + " ~" * (count - index - 1)
 
     def cleanup(self):
         """
@@ -3,6 +3,8 @@
 # Import necessary components if needed for icon definitions (though not strictly required by the dict itself)
 # from kivymd.icon_definitions import md_icons # This import is usually needed elsewhere when *using* the icon names
 
+from typing import Final
+
 # --- Constants ---
 
 # Mapping of internal keys to KivyMD icon names and descriptions
@@ -37,6 +39,9 @@ ICONS = {
     "theme_dark": "weather-night",
 }
 
+# Descriptions keyed by their icon key, split out once so lookups need no key formatting
+_ICON_DESCS: Final = {key[:-5]: desc for key, desc in ICONS.items() if key.endswith("_desc")}
+
 # --- Icon Helper Functions ---
 
 def get_icon(icon_key: str) -> str | None:
@@ -46,5 +51,5 @@ def get_icon(icon_key: str) -> str | None:
 
 def get_icon_desc(icon_key: str) -> str | None:
     """Retrieves the description for a given internal icon key."""
-    # Assumes descriptions follow the pattern icon_key + "_desc"
-    return ICONS.get(f"{icon_key}_desc")
\ No newline at end of file
+    # Descriptions are the ICONS entries named icon_key + "_desc"
+    return _ICON_DESCS.get(icon_key)
\ No newline at end of file
@@ -5,11 +5,11 @@
 from kivy.animation import Animation
 from kivy.metrics import dp, sp
 from kivy.properties import (StringProperty, NumericProperty,
-                           BooleanProperty, ObjectProperty, ReferenceListProperty)
+                           BooleanProperty, ObjectProperty)
 from kivy.uix.widget import Widget
-from kivy.graphics import Color, Line
+from kivy.graphics import Color, Line, Rectangle
 from kivy.clock import Clock
-from kivy.uix.label import Label
+from kivy.core.text import Label as CoreLabel
 from kivy.logger import Logger
 
 # Import ThemableBehavior from kivymd.theming
@@ -18,6 +18,9 @@ from kivymd.app import MDApp
 
 # Import tuple for type checking (not strictly needed for _lines_labels but kept for safety)
 from builtins import tuple
+from collections import OrderedDict
+
+NUMBER_TEXTURE_CACHE_SIZE = 256 # Most recently drawn line number textures kept across updates
 
 
 class LineNumber(Widget, ThemableBehavior):
@@ -31,15 +34,28 @@ class LineNumber(Widget, ThemableBehavior):
     line_spacing = NumericProperty(sp(2)) # Not directly used in this manual drawing method
     preferred_width = NumericProperty(dp(40)) # Initial guess, updated based on logical line count
 
-    # Internal properties to track TextInput's size and padding for accurate line number placement
-    _text_input_height = NumericProperty(0) # Used to match height
-    _text_input_padding = ReferenceListProperty(NumericProperty(0), NumericProperty(0), NumericProperty(0), NumericProperty(0)) # Used for vertical alignment
-
-    _line_number_labels = [] # List to keep track of Label widgets
-
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.__text_input = None
+        # Coalesces the text/size/scroll/theme events of one frame into a single redraw
+        self._update_trigger = Clock.create_trigger(self._update_line_numbers, 0)
+        # Rasterized line number textures keyed by (number, font size), least recently used first
+        self._num_texture_cache = OrderedDict()
+        # (digit count, font size) the preferred width was last computed for
+        self._width_key = None
+
+        # Canvas instructions are created once and updated in place on every redraw
+        with self.canvas:
+            self._line_color = Color(0.5, 0.5, 0.5, 1.0)
+            # The vertical separator line to the right of the numbers
+            self._separator = Line(width=dp(0.8))
+        # Pool of number Rectangles; the first _rects_used are drawn this update,
+        # up to _rects_shown were visible after the last one, the rest have zero size
+        self._number_rects = []
+        self._rects_used = 0
+        self._rects_shown = 0
+        # Line number color from the theme, recomputed only after a theme change
+        self._line_number_rgba = None
         # Use TextInput's font size for consistency, set during binding
         self.line_number_font_size = sp(16) # Default, will be updated
 
@@ -51,14 +67,34 @@ class LineNumber(Widget, ThemableBehavior):
             self._on_text_input_changed(self, self.text_input)
 
         # Bind to theme changes to update line number colors
+        # The app's theme is looked up once here; every redraw reads self._theme_cls
         app = MDApp.get_running_app()
-        if app and hasattr(app, 'theme_cls'):
-            app.theme_cls.bind(
-                theme_style=self._trigger_line_number_update,
-                primary_palette=self._trigger_line_number_update
+        self._theme_cls = app.theme_cls if app and hasattr(app, 'theme_cls') else None
+        if self._theme_cls:
+            self._theme_cls.bind(
+                theme_style=self._on_theme_change,
+                primary_palette=self._on_theme_change
             )
         Logger.info("LineNumber: Initialized.")
 
+    def _on_theme_change(self, *args):
+        """Drops the cached line number color and redraws with the new theme."""
+        self._line_number_rgba = None
+        self._trigger_line_number_update()
+
+    def _get_line_number_rgba(self):
+        """Returns the line number color for the current theme, computing it once per theme change."""
+        if self._line_number_rgba is None:
+            theme_cls = self._theme_cls
+            if theme_cls:
+                is_dark = theme_cls.theme_style == "Dark"
+                self._line_number_rgba = theme_cls.text_color[:3] + [0.6] if is_dark else theme_cls.primary_color[:3] + [0.8]
+            else:
+                # Default color if theme is not available
+                Logger.warning("LineNumber: MDApp or theme_cls not found. Using default line number color.")
+                self._line_number_rgba = (0.5, 0.5, 0.5, 1.0)
+        return self._line_number_rgba
+
     def _on_text_input_changed(self, instance, value):
         """
         Handles changes to the text_input property, binding/unbinding events
@@ -90,9 +126,6 @@ class LineNumber(Widget, ThemableBehavior):
             Logger.info("LineNumber: Bound to new TextInput.")
 
             # Initial updates based on TextInput's current state
-            # Get initial height and padding from TextInput (they are bound in CodeEditor)
-            self._text_input_height = self.__text_input.height
-            self._text_input_padding = self.__text_input.padding
             self.line_number_font_size = self.__text_input.font_size
 
             self._update_preferred_width()
@@ -115,22 +148,23 @@ class LineNumber(Widget, ThemableBehavior):
             Logger.warning("LineNumber: _update_preferred_width called without text_input.")
             return
 
-        # Use logical lines count to determine required width for numbers
-        logical_lines = self.__text_input.text.splitlines()
-        num_logical_lines = len(logical_lines)
-
-        # Account for the last line if it doesn't end with a newline
-        if self.__text_input.text != '' and not self.__text_input.text.endswith('\n'):
-            num_logical_lines += 1
-        # Handle a completely empty TextInput
-        elif self.__text_input.text == '':
-             num_logical_lines = 1 # Always show line 1
-
+        # Count logical lines with one C-level scan instead of splitting the whole text
+        text = self.__text_input.text
+        if not text:
+            num_logical_lines = 1 # Always show line 1
+        else:
+            num_logical_lines = text.count('\n') + (0 if text.endswith('\n') else 1)
 
         num_digits = len(str(num_logical_lines))
         # Optional: ensure width for future lines, e.g., up to 999 lines need 3 digits
         # num_digits = max(3, num_digits)
 
+        # The width only depends on the digit count and font size; most calls change neither
+        width_key = (num_digits, self.__text_input.font_size)
+        if width_key == self._width_key:
+            return
+        self._width_key = width_key
+
         # Estimate character width based on TextInput's font size (adjust if needed for monospaced font)
         # Assumes TextInput.font_size is set and reasonable.
         char_width_estimate = self.__text_input.font_size * 0.65 if self.__text_input and self.__text_input.font_size else sp(16) * 0.65 # Use a default if font_size is zero/None
@@ -152,8 +186,7 @@ class LineNumber(Widget, ThemableBehavior):
         Schedules an update to the line numbers on the next frame.
         This prevents excessive updates during rapid changes to TextInput (e.g., typing).
         """
-        Clock.unschedule(self._update_line_numbers)
-        Clock.schedule_once(self._update_line_numbers, 0)
+        self._update_trigger()
         # Logger.info("LineNumber: Scheduled line number update.") # Keep logging minimal for loop detection
 
 
@@ -169,122 +202,121 @@ class LineNumber(Widget, ThemableBehavior):
             Logger.warning("LineNumber: _update_line_numbers called without text_input.")
             return
 
-        # Clear all existing line number labels
-        for label_widget in self._line_number_labels:
-            self.remove_widget(label_widget)
-        self._line_number_labels.clear()
-        # Logger.info("LineNumber: Cleared old line number labels.") # Keep logging minimal
-
-        # Clear old graphics and redraw the separator line
-        self.canvas.clear()
-        with self.canvas:
-            app = MDApp.get_running_app()
-            if app and hasattr(app, 'theme_cls'):
-                theme_cls = app.theme_cls
-                is_dark = theme_cls.theme_style == "Dark"
-                line_number_color = theme_cls.text_color[:3] + [0.6] if is_dark else theme_cls.primary_color[:3] + [0.8]
-                Color(*line_number_color)
-            else:
-                Color(0.5, 0.5, 0.5, 1.0) # Default color if theme is not available
-                Logger.warning("LineNumber: MDApp or theme_cls not found. Using default line number color.")
-
-            # Draw the vertical separator line to the right of the numbers
-            Line(points=[self.x + self.preferred_width - dp(0.8), self.y, # Adjusted x slightly for the line
-                         self.x + self.preferred_width - dp(0.8), self.top], # Adjusted x slightly for the line
-                 width=dp(0.8))
-
-        # Ensure LineNumber widget's position and height match TextInput's for proper alignment
-        # These are bound in CodeEditor's _setup_ui, but we set internal properties here
-        # to ensure we have the correct values for calculations.
-        self._text_input_height = self.__text_input.height
-        self._text_input_padding = self.__text_input.padding
-        self.height = self._text_input_height # Ensure LineNumber height matches TextInput
+        # Update the color and separator line in place
+        self._line_color.rgba = self._get_line_number_rgba()
+
+        self._separator.points = [self.x + self.preferred_width - dp(0.8), self.y, # Adjusted x slightly for the line
+                                  self.x + self.preferred_width - dp(0.8), self.top] # Adjusted x slightly for the line
+
+        self._rects_used = 0
+        self._draw_visible_numbers()
+
+        # Hide pooled Rectangles that showed numbers last time but aren't needed now
+        for rect in self._number_rects[self._rects_used:self._rects_shown]:
+            rect.size = (0, 0)
+        self._rects_shown = self._rects_used
+
+    def _draw_visible_numbers(self):
+        """Positions a number for each visual line inside the viewport."""
+        text_input = self.__text_input
+        # Read the TextInput and widget properties once; the loop below only uses these locals
+        height = text_input.height
+        pad_top = text_input.padding[1]
+        line_height = text_input.line_height
+        # Ensure LineNumber height matches TextInput for proper alignment
+        # (also bound in CodeEditor's _setup_ui)
+        self.height = height
+        # Right edge of the numbers and this widget's bottom, shared by every number
+        number_right = self.x + self.preferred_width - dp(5)
+        bottom = self.y
 
         # Get the visual lines from TextInput's internal structure (_lines is a list of strings)
-        visual_lines_count = len(self.__text_input._lines)
+        visual_lines_count = len(text_input._lines)
 
         # Handle empty text: always show line 1
-        if visual_lines_count == 0 and self.__text_input.text.strip() == '':
+        if visual_lines_count == 0 and text_input.text.strip() == '':
             Logger.info("LineNumber: TextInput is empty, drawing line '1'.")
-            # Position '1' aligned with the bottom padding when empty
-            # Use the height of the first visual line position from the top for alignment
-            drawing_y_empty = self.height - self.__text_input.padding[1] - self.__text_input.line_height
-            if self.__text_input.line_height <= 0:
+            # Position '1' aligned with the first visual line position from the top
+            if line_height <= 0:
                 # Fallback if line_height is not set yet
-                 drawing_y_empty = self.height - self.__text_input.padding[1] - sp(20)
-
-            self.__draw_line_number(1, drawing_y_empty)
+                line_height = sp(20)
+            self.__draw_line_number(1, number_right, bottom + height - pad_top - line_height, line_height)
             return # Exit if empty, only draw line 1
 
         # Handle case with text but no visual lines yet (rare)
-        if visual_lines_count == 0 and self.__text_input.text.strip() != '':
+        if visual_lines_count == 0:
              visual_lines_count = 1 # Assume at least one visual line if text exists
 
-        # Iterate through the VISUAL lines for positioning and display (1 to visual_lines_count)
-        for i in range(visual_lines_count):
-            visual_line_num = i + 1 # Human-readable visual line number (1-based)
+        # Ensure line_height is not zero before drawing
+        if line_height <= 0:
+            Logger.warning("LineNumber: Skipping draw of %s visual lines due to zero line height.", visual_lines_count)
+            return
 
-            # Calculate the y position for the bottom of the label, from the TOP of the TextInput's visible area.
-            # This y_pos is relative to the BOTTOM of the LineNumber widget.
-            # Start from the top of the TextInput's visible area (relative to LineNumber's bottom, self.y): self.height - self.__text_input.padding[1]
-            # Subtract the distance from the top of the visible area to the bottom of the i-th visual line: (i + 1) * self.__text_input.line_height
-            # This positions the bottom of the label correctly from top to bottom, aligned with visual lines.
-            drawing_y = self.height - self.__text_input.padding[1] - (i + 1) * self.__text_input.line_height
+        # TextInput advances each visual line by line_height + line_spacing and shifts them up by scroll_y
+        line_pitch = line_height + text_input.line_spacing
+        scroll_y = text_input.scroll_y
+        # Bottom of the first visual line, in window coordinates
+        first_line_bottom = bottom + height - pad_top + scroll_y - line_height
 
+        # Only the lines inside the viewport are drawn, not every line in the file
+        first_visible = max(0, int((scroll_y - pad_top) // line_pitch))
+        last_visible = min(visual_lines_count, first_visible + int(height // line_pitch) + 2)
 
-            # Ensure line_height is not zero before drawing
-            if self.__text_input.line_height > 0:
-                 # Use the visual line number for display
-                 self.__draw_line_number(visual_line_num, drawing_y) # Draw visual line number at visual line position
-            else:
-                Logger.warning(f"LineNumber: Skipping draw for visual line {i+1} due to zero line height.")
+        # Iterate through the visible VISUAL lines, drawing their visual line numbers (1-based);
+        # each line sits one pitch below the previous, so step the position instead of recomputing it
+        line_bottom = first_line_bottom - first_visible * line_pitch
+        for line_num in range(first_visible + 1, last_visible + 1):
+            self.__draw_line_number(line_num, number_right, line_bottom, line_height)
+            line_bottom -= line_pitch
 
     # Removed the incomplete _get_logical_line_numbers_for_visual_lines method entirely for now.
     # We can revisit accurate logical line numbering display with wrapping as a separate feature.
 
     # --- End CodeFu Enhancement ---
 
-    def __draw_line_number(self, line_num, y_pos):
+    def _get_number_texture(self, line_num):
         """
-        Creates and adds a Label widget for a single line number.
-        Positioning and sizing are calculated to align with the TextInput's lines.
-        `y_pos` is the calculated y-coordinate for the bottom of the line number label, relative to LineNumber's self.y.
+        Returns the texture for a line number, rasterizing it on first use.
+        Numbers are rendered white and tinted by the canvas Color, so the theme doesn't affect the texture.
         """
-        # Use TextInput's line_height for line number label height for consistent spacing
-        actual_line_height = self.__text_input.line_height if self.__text_input and self.__text_input.line_height > 0 else sp(20)
-
-        label_widget = Label(
-            text=str(line_num),
-            font_name='InriaSans-Regular', # Ensure this font is available and registered
-            font_size=self.__text_input.font_size, # Use TextInput's font size for consistent visual scale
-            halign='right', # Align text to the right within the label's bounds
-            valign='middle', # Vertically center text within its bounds
-            size_hint=(None, None), # Important for setting custom size/pos
-        )
-
-        # Set the color of the Label widget based on the current KivyMD theme
-        app = MDApp.get_running_app()
-        if app and hasattr(app, 'theme_cls'):
-            theme_cls = app.theme_cls
-            is_dark = theme_cls.theme_style == "Dark"
-            # Use a slightly less opaque color for line numbers
-            line_number_color_rgba = theme_cls.text_color[:3] + [0.6] if is_dark else theme_cls.primary_color[:3] + [0.8]
-            label_widget.color = line_number_color_rgba
+        font_size = self.__text_input.font_size
+        key = (line_num, font_size)
+        cache = self._num_texture_cache
+        texture = cache.get(key)
+        if texture is not None:
+            cache.move_to_end(key)
+        else:
+            core_label = CoreLabel(
+                text=str(line_num),
+                font_name='InriaSans-Regular', # Ensure this font is available and registered
+                font_size=font_size) # Use TextInput's font size for consistent visual scale
+            core_label.refresh()
+            texture = core_label.texture
+            cache[key] = texture
+            if len(cache) > NUMBER_TEXTURE_CACHE_SIZE:
+                cache.popitem(last=False)
+        return texture
+
+    def __draw_line_number(self, line_num, right, line_bottom, line_height):
+        """
+        Draws a single line number as a textured Rectangle on this widget's canvas,
+        right-aligned at `right` and centered on the line slot of `line_height` whose
+        bottom is at `line_bottom`. The caller works these out once per update.
+        """
+        texture = self._get_number_texture(line_num)
+        texture_width, texture_height = texture.size
+        pos = (right - texture_width, line_bottom + (line_height - texture_height) / 2)
+
+        # Reuse a pooled Rectangle, growing the pool only when more lines are visible than before
+        index = self._rects_used
+        if index < len(self._number_rects):
+            rect = self._number_rects[index]
+            rect.texture = texture
+            rect.pos = pos
+            rect.size = texture.size
         else:
-            label_widget.color = [0.5, 0.5, 0.5, 1.0] # Default color if theme is not available
-
-        # Set Label widget's size to occupy the entire preferred_width of LineNumber and actual line height.
-        label_widget.size = (self.preferred_width, actual_line_height)
-        # Position Label widget at LineNumber's x and the calculated y_pos
-        # `self.x` is the LineNumber widget's x-position (its left edge).
-        # `self.y + y_pos` positions the label relative to the LineNumber widget's bottom-left corner.
-        label_widget.pos = (self.x, self.y + y_pos)
-
-        # Set text_size for alignment and padding within the label_widget's bounds.
-        # This creates an internal box for the text. With halign='right', the text
-        # will align to the right, providing dp(5) padding on both left and right.
-        # We are using dp(10) total horizontal padding for the text within the label_widget.
-        label_widget.text_size = (self.preferred_width - dp(10), actual_line_height)
-
-        self.add_widget(label_widget)
-        self._line_number_labels.append(label_widget)
\ No newline at end of file
+            with self.canvas:
+                # Added after the separator, so the line number Color applies
+                rect = Rectangle(texture=texture, pos=pos, size=texture.size)
+            self._number_rects.append(rect)
+        self._rects_used = index + 1